@@ -16,6 +16,12 @@ Example usages:
     # Print changed files for PR #42
     python scripts/github_tools.py files octocat/Hello-World 42
 
+    # Stream every changed file of PR #42 as NDJSON, 100 per page
+    python scripts/github_tools.py files octocat/Hello-World 42 --all --per-page 100
+
+    # Fetch metadata, every changed file and the diff of PR #42 in one go
+    python scripts/github_tools.py bundle octocat/Hello-World 42
+
 The token can be supplied via --token or by configuring GITHUB_TOKEN in .env.
 """
 
@@ -23,19 +29,75 @@ from __future__ import annotations
 
 import argparse
 import asyncio
-import json
 import sys
+from collections.abc import AsyncIterator, Awaitable, Callable
 from pathlib import Path
 from typing import Any
 
+import orjson
+
 from src.app.core.settings import Settings
+from src.app.github.cache import DEFAULT_ETAG_CACHE_PATH, ETagCache
 from src.app.github.client import GitHubClient
 
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - uvloop does not support Windows
+    uvloop = None
+
+
+# Keyed on every constructor input so differently configured callers never share
+_ClientKey = tuple[str | None, str, float, str, ETagCache | None]
+_CLIENTS: dict[_ClientKey, GitHubClient] = {}
+
 
 def _load_settings() -> Settings:
     return Settings()
 
 
+def get_client(
+    token: str | None,
+    settings: Settings | None = None,
+    etag_cache: ETagCache | None = None,
+) -> GitHubClient:
+    """Return a process-wide GitHub client for this configuration.
+
+    Batch scripts that touch many pull requests should call this instead of
+    constructing ``GitHubClient`` directly so every request reuses the same
+    pooled keep-alive connections (one TCP/TLS handshake per host). The clients
+    stay open until ``close_clients`` runs.
+    """
+
+    settings = settings or _load_settings()
+    key: _ClientKey = (
+        token,
+        settings.github_api_url,
+        settings.github_timeout,
+        settings.github_user_agent,
+        etag_cache,
+    )
+    client = _CLIENTS.get(key)
+    if client is None or client.is_closed:
+        client = GitHubClient(
+            token=token,
+            base_url=settings.github_api_url,
+            timeout=settings.github_timeout,
+            user_agent=settings.github_user_agent,
+            etag_cache=etag_cache,
+        )
+        _CLIENTS[key] = client
+    return client
+
+
+async def close_clients() -> None:
+    """Close every client handed out by ``get_client``; call once before exiting."""
+
+    clients = list(_CLIENTS.values())
+    _CLIENTS.clear()
+    for client in clients:
+        await client.aclose()
+
+
 def _resolve_token(explicit: str | None, settings: Settings) -> str | None:
     if explicit:
         return explicit
@@ -43,6 +105,14 @@ def _resolve_token(explicit: str | None, settings: Settings) -> str | None:
 
 
 async def _run_list(client: GitHubClient, args: argparse.Namespace) -> None:
+    if args.all:
+        await _print_ndjson(
+            client.iter_pull_requests(
+                args.owner, args.repo, state=args.state, per_page=args.per_page
+            )
+        )
+        return
+
     pull_requests = await client.list_pull_requests(
         args.owner,
         args.repo,
@@ -58,17 +128,30 @@ async def _run_metadata(client: GitHubClient, args: argparse.Namespace) -> None:
     _print_json(pr)
 
 
+async def _run_bundle(client: GitHubClient, args: argparse.Namespace) -> None:
+    bundle = await client.fetch_pr_bundle(args.owner, args.repo, args.number)
+    _print_json(bundle)
+
+
 async def _run_diff(client: GitHubClient, args: argparse.Namespace) -> None:
-    diff_text = await client.get_pull_request_diff(args.owner, args.repo, args.number)
-    _output_text(diff_text, args.output)
+    chunks = client.stream_pull_request_diff(args.owner, args.repo, args.number)
+    await _output_stream(chunks, args.output)
 
 
 async def _run_patch(client: GitHubClient, args: argparse.Namespace) -> None:
-    patch_text = await client.get_pull_request_patch(args.owner, args.repo, args.number)
-    _output_text(patch_text, args.output)
+    chunks = client.stream_pull_request_patch(args.owner, args.repo, args.number)
+    await _output_stream(chunks, args.output)
 
 
 async def _run_files(client: GitHubClient, args: argparse.Namespace) -> None:
+    if args.all:
+        await _print_ndjson(
+            client.iter_pull_request_files(
+                args.owner, args.repo, args.number, per_page=args.per_page
+            )
+        )
+        return
+
     files = await client.get_pull_request_files(
         args.owner,
         args.repo,
@@ -80,6 +163,14 @@ async def _run_files(client: GitHubClient, args: argparse.Namespace) -> None:
 
 
 async def _run_commits(client: GitHubClient, args: argparse.Namespace) -> None:
+    if args.all:
+        await _print_ndjson(
+            client.iter_pull_request_commits(
+                args.owner, args.repo, args.number, per_page=args.per_page
+            )
+        )
+        return
+
     commits = await client.get_pull_request_commits(
         args.owner,
         args.repo,
@@ -90,30 +181,79 @@ async def _run_commits(client: GitHubClient, args: argparse.Namespace) -> None:
     _print_json(commits)
 
 
+_Handler = Callable[[GitHubClient, argparse.Namespace], Awaitable[None]]
+
+# command -> (handler, whether a pull request number is required)
+_COMMANDS: dict[str, tuple[_Handler, bool]] = {
+    "list": (_run_list, False),
+    "metadata": (_run_metadata, True),
+    "bundle": (_run_bundle, True),
+    "diff": (_run_diff, True),
+    "patch": (_run_patch, True),
+    "files": (_run_files, True),
+    "commits": (_run_commits, True),
+}
+
+
 def _print_json(payload: Any) -> None:
-    json.dump(payload, sys.stdout, indent=2, sort_keys=True)
-    sys.stdout.write("\n")
+    sys.stdout.flush()
+    sys.stdout.buffer.write(
+        orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+    )
+    sys.stdout.buffer.write(b"\n")
+    sys.stdout.buffer.flush()
+
+
+async def _print_ndjson(items: AsyncIterator[Any]) -> None:
+    """Write one compact JSON document per line as items arrive."""
+    sys.stdout.flush()
+    async for item in items:
+        sys.stdout.buffer.write(orjson.dumps(item) + b"\n")
+    sys.stdout.buffer.flush()
 
 
-def _output_text(content: str, destination: str | None) -> None:
+async def _output_stream(chunks: AsyncIterator[bytes], destination: str | None) -> None:
     if destination:
         output_path = Path(destination)
-        output_path.write_text(content, encoding="utf-8")
+        with output_path.open("wb") as handle:
+            async for chunk in chunks:
+                handle.write(chunk)
         print(f"Wrote output to {output_path}")
     else:
-        print(content)
+        sys.stdout.flush()
+        async for chunk in chunks:
+            sys.stdout.buffer.write(chunk)
+        sys.stdout.buffer.write(b"\n")
+        sys.stdout.buffer.flush()
 
 
 def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="GitHub PR helper utilities")
-    parser.add_argument("command", choices=["list", "metadata", "diff", "patch", "files", "commits"])
+    parser.add_argument("command", choices=list(_COMMANDS))
     parser.add_argument("repo_slug", help="Repository in owner/repo format")
     parser.add_argument("number", nargs="?", type=int, help="Pull request number where required")
     parser.add_argument("--token", dest="token", help="GitHub personal access token")
-    parser.add_argument("--state", default="open", help="Filter pull requests by state (list command)")
-    parser.add_argument("--per-page", dest="per_page", type=int, default=30, help="Items per page for list endpoints")
+    parser.add_argument(
+        "--state", default="open", help="Filter pull requests by state (list command)"
+    )
+    parser.add_argument(
+        "--per-page",
+        dest="per_page",
+        type=int,
+        default=30,
+        help="Items per page for list endpoints",
+    )
     parser.add_argument("--page", type=int, default=1, help="Result page to fetch")
+    parser.add_argument(
+        "--all", action="store_true", help="Fetch every page (list/files/commits) and print NDJSON"
+    )
     parser.add_argument("--output", help="File path to write diff/patch output")
+    parser.add_argument(
+        "--no-cache",
+        dest="use_cache",
+        action="store_false",
+        help="Bypass the ETag cache and always download full responses",
+    )
     return parser
 
 
@@ -132,37 +272,28 @@ async def _dispatch(args: argparse.Namespace) -> None:
     if token is None:
         raise SystemExit("GitHub token is required; provide via --token or GITHUB_TOKEN in .env")
 
-    client = GitHubClient(
-        token=token,
-        base_url=settings.github_api_url,
-        timeout=settings.github_timeout,
-        user_agent=settings.github_user_agent,
-    )
+    handler, needs_number = _COMMANDS[args.command]
+    if needs_number:
+        _ensure_number(args)
+    args.owner, args.repo = owner, repo
+
+    etag_cache = None
+    if args.use_cache:
+        etag_cache = ETagCache(
+            settings.github_etag_cache_path or DEFAULT_ETAG_CACHE_PATH,
+            max_entries=settings.github_etag_cache_size,
+            max_bytes=settings.github_etag_cache_max_bytes,
+            max_body_bytes=settings.github_etag_cache_max_body_bytes,
+            ttl=settings.github_etag_cache_ttl,
+        )
+    await handler(get_client(token, settings, etag_cache), args)
+
 
-    async with client:
-        if args.command == "list":
-            args.owner, args.repo = owner, repo
-            await _run_list(client, args)
-        elif args.command == "metadata":
-            _ensure_number(args)
-            args.owner, args.repo = owner, repo
-            await _run_metadata(client, args)
-        elif args.command == "diff":
-            _ensure_number(args)
-            args.owner, args.repo = owner, repo
-            await _run_diff(client, args)
-        elif args.command == "patch":
-            _ensure_number(args)
-            args.owner, args.repo = owner, repo
-            await _run_patch(client, args)
-        elif args.command == "files":
-            _ensure_number(args)
-            args.owner, args.repo = owner, repo
-            await _run_files(client, args)
-        elif args.command == "commits":
-            _ensure_number(args)
-            args.owner, args.repo = owner, repo
-            await _run_commits(client, args)
+async def _run(args: argparse.Namespace) -> None:
+    try:
+        await _dispatch(args)
+    finally:
+        await close_clients()
 
 
 def _ensure_number(args: argparse.Namespace) -> None:
@@ -173,7 +304,9 @@ def _ensure_number(args: argparse.Namespace) -> None:
 def main() -> None:
     parser = _build_parser()
     args = parser.parse_args()
-    asyncio.run(_dispatch(args))
+    # uvloop is a declared dependency except on Windows; fall back to the default loop there
+    loop_factory = uvloop.new_event_loop if uvloop is not None else None
+    asyncio.run(_run(args), loop_factory=loop_factory)
 
 
 if __name__ == "__main__":
@@ -1,4 +1,5 @@
-from .base import BaseAgent
+from ._llm_json import LLMJsonAgent
+from .base import BaseAgent, PromptContext
 from .logic import LogicAgent
 from .manager import AgentOrchestrator
 from .performance import PerformanceAgent
@@ -7,6 +8,8 @@ from .security import SecurityAgent
 
 __all__ = [
     "BaseAgent",
+    "LLMJsonAgent",
+    "PromptContext",
     "LogicAgent",
     "PerformanceAgent",
     "ReadabilityAgent",
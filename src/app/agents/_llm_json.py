@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import re
+from typing import Any, ClassVar
+
+import orjson
+
+from src.app.agents.base import BaseAgent, PromptContext
+from src.app.core.logging_config import get_logger
+from src.app.models.base import ReviewCategory, Severity
+from src.app.models.code import CodeChunk
+from src.app.models.review import ReviewComment
+
+logger = get_logger(__name__)
+
+# A whole reply wrapped in a markdown code block, e.g. ```json\n[...]\n```
+_FENCE_RE = re.compile(r"^```[^\n]*\n(.*?)\s*```$", re.DOTALL)
+
+
+def strip_code_fences(response: str) -> str:
+    """Return the reply without surrounding whitespace or a wrapping code block."""
+    cleaned = response.strip()
+    fenced = _FENCE_RE.match(cleaned)
+    return fenced.group(1) if fenced else cleaned
+
+
+class LLMJsonAgent(BaseAgent):
+    """Agent that prompts the LLM for a JSON array of issues in one category.
+
+    Subclasses only configure the class attributes below; prompting, response
+    parsing and comment construction are shared.
+    """
+
+    category: ClassVar[ReviewCategory]
+    # Severities this agent may report; anything else maps to default_severity
+    severities: ClassVar[dict[str, Severity]]
+    default_severity: ClassVar[Severity]
+    default_message: ClassVar[str]
+    # Agent-specific prompt parts; only the shared chunk section varies per call.
+    # ``issue_format`` is left out when the orchestrator fuses several agents.
+    role: ClassVar[str]
+    focus: ClassVar[str]
+    issue_format: ClassVar[str]
+
+    def __init__(self, llm: object) -> None:
+        super().__init__(name=self.category.value)
+        self._llm = llm
+
+    async def analyze(self, chunk: CodeChunk) -> list[ReviewComment]:
+        """Analyze a code chunk with a single LLM call."""
+        if not chunk.new_lines:
+            return []
+
+        prompt = self.build_prompt(chunk)
+
+        try:
+            response = await self._llm.generate(  # type: ignore[attr-defined]
+                prompt, temperature=self.temperature, max_tokens=self.max_tokens
+            )
+            return self.parse_response(response, chunk)
+        except Exception as e:
+            logger.error(f"{self.name}_agent_error", error=str(e), file=chunk.file_path)
+            return []
+
+    def build_prompt(self, chunk: CodeChunk, ctx: PromptContext | None = None) -> str:
+        """Build this agent's analysis prompt."""
+        ctx = ctx or PromptContext.from_chunk(chunk)
+        return f"{self.role}\n\n{ctx.section}\n\n{self.focus}\n\n{self.issue_format}"
+
+    def build_focus(self) -> str:
+        """Describe this review without the code or its array-only output rules."""
+        allowed = " | ".join(f'"{severity}"' for severity in self.severities)
+        return f"{self.role}\n\n{self.focus}\n\nSeverities for this review: {allowed}"
+
+    def parse_response(self, response: str | list[Any], chunk: CodeChunk) -> list[ReviewComment]:
+        """Parse LLM JSON response (or an already-decoded issue list) into comments."""
+        if isinstance(response, list):
+            return self._build_comments(response, chunk)
+
+        if not response or not response.strip():
+            return []
+
+        cleaned = strip_code_fences(response)
+
+        # Clean code is the common case; skip the JSON parser for an empty list
+        if not cleaned or cleaned == "[]":
+            return []
+
+        try:
+            issues = orjson.loads(cleaned)
+        except orjson.JSONDecodeError as e:
+            logger.warning(f"{self.name}_agent_json_error", error=str(e), response=response[:200])
+            return []
+
+        if not isinstance(issues, list):
+            logger.warning(f"{self.name}_agent_invalid_format", file=chunk.file_path)
+            return []
+
+        return self._build_comments(issues, chunk)
+
+    def _build_comments(self, issues: list[Any], chunk: CodeChunk) -> list[ReviewComment]:
+        """Map decoded LLM issues onto ReviewComment objects."""
+        try:
+            return self._to_comments(issues, chunk)
+        except (ValueError, KeyError, AttributeError):
+            pass
+
+        # Some issue is malformed: redo the batch one at a time so only it is dropped
+        comments = []
+        for issue in issues:
+            try:
+                comments.extend(self._to_comments([issue], chunk))
+            except (ValueError, KeyError, AttributeError) as e:
+                logger.warning(f"{self.name}_agent_parse_issue", error=str(e), issue=issue)
+
+        return comments
+
+    def _to_comments(self, issues: list[Any], chunk: CodeChunk) -> list[ReviewComment]:
+        """Build comments for a batch of issues; raises on the first malformed one."""
+        file_path, default_line, agent_name = chunk.file_path, chunk.start_line, self.name
+        category, message = self.category, self.default_message
+        severities, default_severity = self.severities, self.default_severity
+        return [
+            ReviewComment(
+                file_path=file_path,
+                # The prompt numbers lines as they appear in the file
+                line_number=issue.get("line", default_line),
+                severity=severities.get(
+                    issue.get("severity", default_severity.value).lower(), default_severity
+                ),
+                category=category,
+                message=issue.get("message", message),
+                suggestion=issue.get("suggestion"),
+                agent_name=agent_name,
+            )
+            for issue in issues
+        ]
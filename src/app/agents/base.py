@@ -1,10 +1,75 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any
 
 from src.app.models.code import CodeChunk
 from src.app.models.review import ReviewComment
 
+# Unchanged lines kept around each added line when a chunk is excerpted
+PROMPT_CONTEXT_LINES = 3
+
+
+def _numbered_excerpt(chunk: CodeChunk) -> str:
+    """Render the added lines plus nearby context with their file line numbers.
+
+    Lines are prefixed ``+`` (added) or a space (context); gaps between windows
+    are marked with ``...``. Chunks without recorded additions are shown whole.
+    """
+    lines = chunk.new_lines
+    changed = set(chunk.changed_line_indices)
+    if changed:
+        keep = sorted(
+            {
+                index
+                for changed_index in changed
+                for index in range(
+                    max(0, changed_index - PROMPT_CONTEXT_LINES),
+                    min(len(lines), changed_index + PROMPT_CONTEXT_LINES + 1),
+                )
+            }
+        )
+    else:
+        keep = list(range(len(lines)))
+
+    rendered: list[str] = []
+    previous = None
+    for index in keep:
+        if previous is not None and index != previous + 1:
+            rendered.append("   ...")
+        marker = "+" if index in changed else " "
+        rendered.append(f"{marker}{chunk.start_line + index:5d}: {lines[index]}")
+        previous = index
+    return "\n".join(rendered)
+
+
+@dataclass(frozen=True, slots=True)
+class PromptContext:
+    """Chunk-specific prompt text rendered once and shared by every agent."""
+
+    header: str
+    code: str
+    section: str
+
+    @classmethod
+    def from_chunk(cls, chunk: CodeChunk) -> PromptContext:
+        header = (
+            f"FILE: {chunk.file_path}\n"
+            f"LANGUAGE: {chunk.language.value if chunk.language else 'unknown'}\n"
+            f"LINES: {chunk.start_line} - {chunk.start_line + len(chunk.new_lines) - 1}"
+        )
+        code = _numbered_excerpt(chunk)
+        return cls(
+            header=header,
+            code=code,
+            section=(
+                f"{header}\n\n"
+                "CODE TO REVIEW (file line number before each line, added lines marked +):\n"
+                f"```\n{code}\n```"
+            ),
+        )
+
 
 class BaseAgent(ABC):
     """Abstract base class for all review agents.
@@ -12,9 +77,15 @@ class BaseAgent(ABC):
     Contract:
     - Input: CodeChunk (single chunk of changed code)
     - Output: list[ReviewComment]
+
+    LLM-backed agents may additionally implement ``build_prompt``,
+    ``build_focus`` and ``parse_response`` so the orchestrator can fuse several
+    agents' reviews into a single LLM request per chunk.
     """
 
     name: str
+    temperature: float = 0.2
+    max_tokens: int = 800
 
     def __init__(self, name: str) -> None:
         self.name = name
@@ -22,3 +93,22 @@ class BaseAgent(ABC):
     @abstractmethod
     async def analyze(self, chunk: CodeChunk) -> list[ReviewComment]:
         """Analyze a single code chunk and return review comments."""
+
+    def build_prompt(self, chunk: CodeChunk, ctx: PromptContext | None = None) -> str | None:
+        """Return the LLM prompt for a chunk, or None if prompts can't be batched.
+
+        ``ctx`` lets callers that prompt several agents render the chunk once.
+        """
+        return None
+
+    def build_focus(self) -> str | None:
+        """Return this agent's review brief for a fused prompt, or None to run alone.
+
+        The brief covers what to look for but neither the code, which the fused
+        prompt shows once, nor an output format, which the fused prompt sets.
+        """
+        return None
+
+    def parse_response(self, response: str | list[Any], chunk: CodeChunk) -> list[ReviewComment]:
+        """Convert a raw LLM response (or decoded issue list) into comments."""
+        return []
@@ -1,35 +1,298 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Iterable, Sequence
+import hashlib
+from collections.abc import Coroutine, Iterable, Sequence
+from typing import Any
 
-from src.app.agents.base import BaseAgent
+import orjson
+
+from src.app.agents._llm_json import strip_code_fences
+from src.app.agents.base import BaseAgent, PromptContext
+from src.app.core.logging_config import get_logger
+from src.app.llm.client import SupportsGenerate
+from src.app.models.base import Language
 from src.app.models.code import CodeChunk
 from src.app.models.review import ReviewComment
 
+logger = get_logger(__name__)
+
+_BATCH_PROMPT_HEADER = """You are a panel of expert code reviewers. Perform each of the independent reviews listed after the code and answer all of them in ONE response.
+
+{section}"""
+
+_BATCH_PROMPT_FOOTER = """Return ONLY a valid JSON object with exactly these keys: {keys}.
+Each key maps to a JSON array of the issues found by the review with that name (use [] when it finds none). Each issue has this exact structure:
+{{"line": <line_number_shown_before_the_code>, "severity": <one of that review's severities>, "message": "<clear, specific description>", "suggestion": "<concrete fix or recommendation>"}}
+Do not wrap the object in markdown and do not add explanations."""
+
+
+_C_LINE_COMMENT = ("//",)
+_LINE_COMMENTS: dict[Language, tuple[str, ...]] = {
+    Language.PYTHON: ("#",),
+    Language.RUBY: ("#",),
+    Language.PHP: ("#", *_C_LINE_COMMENT),
+    Language.JAVASCRIPT: _C_LINE_COMMENT,
+    Language.TYPESCRIPT: _C_LINE_COMMENT,
+    Language.JAVA: _C_LINE_COMMENT,
+    Language.GO: _C_LINE_COMMENT,
+    Language.RUST: _C_LINE_COMMENT,
+    Language.CPP: _C_LINE_COMMENT,
+    Language.C: _C_LINE_COMMENT,
+}
+# Every language with // comments also has /* ... */ block comments
+_BLOCK_COMMENTS = frozenset(
+    language for language, prefixes in _LINE_COMMENTS.items() if "//" in prefixes
+)
+
+
+def _is_comment_only(lines: list[str], language: Language) -> bool:
+    """Whether every non-blank line of ``lines`` sits inside a comment.
+
+    Only ``/*`` and ``*/`` delimit block comments, so code such as ``* ptr = 0;``
+    is not mistaken for a continuation line. A ``*/`` before any ``/*`` means
+    the hunk opened inside a comment that started above it.
+    """
+    line_prefixes = _LINE_COMMENTS.get(language)
+    if line_prefixes is None:
+        return False
+    blocks = language in _BLOCK_COMMENTS
+    first_open = next((i for i, line in enumerate(lines) if "/*" in line), len(lines))
+    in_block = blocks and any("*/" in line for line in lines[:first_open])
+    for line in lines:
+        while line:
+            if in_block:
+                _, closed, line = line.partition("*/")
+                in_block = not closed
+                line = line.strip()
+            elif line.startswith(line_prefixes):
+                break
+            elif blocks and line.startswith("/*"):
+                in_block = True
+                line = line[2:]
+            else:
+                return False
+    return True
+
+
+def is_reviewable(chunk: CodeChunk) -> bool:
+    """Return False for chunks that are blank or contain nothing but comments."""
+    stripped = [line.strip() for line in chunk.new_lines if line.strip()]
+    return bool(stripped) and not _is_comment_only(stripped, chunk.language)
+
+
+def _chunk_fingerprint(chunk: CodeChunk) -> bytes:
+    """Content key for a chunk: agents only see the new side, its additions and language."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(chunk.language.value.encode())
+    digest.update(b"\0")
+    digest.update(chunk.code_text.encode())
+    digest.update(b"\0")
+    digest.update(",".join(map(str, chunk.changed_line_indices)).encode())
+    return digest.digest()
+
+
+def _relabel(comment: ReviewComment, source: CodeChunk, target: CodeChunk) -> ReviewComment:
+    """Move a comment produced for ``source`` onto the identical ``target`` chunk."""
+    return comment.model_copy(
+        update={
+            "file_path": target.file_path,
+            "line_number": comment.line_number - source.start_line + target.start_line,
+        }
+    )
+
 
 class AgentOrchestrator:
-    """Runs multiple agents over code chunks and aggregates their comments."""
+    """Runs multiple agents over code chunks and aggregates their comments.
+
+    When an ``llm`` client is supplied, every agent with a ``build_focus`` brief
+    is reviewed in a single LLM request per chunk that shows the code once,
+    cutting round-trips from ``len(agents)`` to one. Agents whose section is
+    missing from the fused reply fall back to their own ``analyze`` call.
+
+    Blank and comment-only chunks are skipped before any agent
+    is scheduled. Chunks with identical content (moved code, repeated refactors)
+    are analyzed once; their comments are re-labelled onto every duplicate. At most
+    ``concurrency`` agent/LLM calls are in flight at once so large PRs do not
+    trip provider rate limits. Each chunk runs in its own task group: an agent
+    crash cancels that chunk's remaining calls and is logged, while the other
+    chunks still report their comments.
+    """
 
-    def __init__(self, agents: Sequence[BaseAgent]) -> None:
+    def __init__(
+        self,
+        agents: Sequence[BaseAgent],
+        llm: SupportsGenerate | None = None,
+        concurrency: int = 8,
+    ) -> None:
         self._agents = list(agents)
+        self._llm = llm
+        self._sem = asyncio.Semaphore(max(1, concurrency))
+
+    async def _bounded(self, agent: BaseAgent, chunk: CodeChunk) -> list[ReviewComment]:
+        async with self._sem:
+            return await agent.analyze(chunk)
 
     async def review(self, chunks: Iterable[CodeChunk]) -> list[ReviewComment]:
-        tasks: list[asyncio.Task[list[ReviewComment]]] = []
+        groups: dict[bytes, list[CodeChunk]] = {}
+        for chunk in filter(is_reviewable, chunks):
+            groups.setdefault(_chunk_fingerprint(chunk), []).append(chunk)
+
+        # Deduplicate each batch as soon as its chunk finishes instead of idling
+        # until the slowest LLM call returns
+        seen: set[ReviewComment] = set()
+        all_comments: list[ReviewComment] = []
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(self._review_group(g)) for g in groups.values()]
+            for next_done in asyncio.as_completed(tasks):
+                for comment in await next_done:
+                    if comment not in seen:
+                        seen.add(comment)
+                        all_comments.append(comment)
+
+        return all_comments
+
+    async def review_stream(self, queue: asyncio.Queue[CodeChunk | None]) -> list[ReviewComment]:
+        """Review chunks as a producer enqueues them; ``None`` ends the stream.
+
+        Agents start on the first chunk while later ones are still being fetched
+        and parsed. Duplicates arriving after their source are relabelled once the
+        stream is done.
+        """
+        groups: dict[bytes, tuple[list[CodeChunk], asyncio.Task[list[ReviewComment]]]] = {}
+        async with asyncio.TaskGroup() as tg:
+            while (chunk := await queue.get()) is not None:
+                if not is_reviewable(chunk):
+                    continue
+                key = _chunk_fingerprint(chunk)
+                if key in groups:
+                    groups[key][0].append(chunk)
+                else:
+                    groups[key] = ([chunk], tg.create_task(self._review_source(chunk)))
+
+        # Everything is in hand here, so dedupe in one order-preserving pass
+        return list(
+            dict.fromkeys(
+                comment
+                for group, task in groups.values()
+                for comment in self._spread(group, task.result())
+            )
+        )
+
+    async def _review_group(self, group: list[CodeChunk]) -> list[ReviewComment]:
+        """Review the first of a group of identical chunks and relabel onto the rest."""
+        return self._spread(group, await self._review_source(group[0]))
+
+    @staticmethod
+    def _spread(group: list[CodeChunk], comments: list[ReviewComment]) -> list[ReviewComment]:
+        """Return ``comments`` for ``group[0]`` plus copies relabelled onto its duplicates."""
+        source = group[0]
+        return comments + [
+            _relabel(comment, source, chunk) for chunk in group[1:] for comment in comments
+        ]
+
+    async def _review_source(self, chunk: CodeChunk) -> list[ReviewComment]:
+        """Review one chunk, logging and swallowing a failure of its task group."""
+        try:
+            return await self._review_chunk(chunk)
+        except* Exception as failures:
+            # Only this chunk's calls were cancelled; the rest of the review goes on
+            logger.error(
+                "orchestrator_chunk_failed",
+                file=chunk.file_path,
+                errors=[str(e) for e in failures.exceptions],
+            )
+        return []
+
+    async def _review_chunk(self, chunk: CodeChunk) -> list[ReviewComment]:
+        """Run every agent over one chunk."""
+        if self._llm is not None and chunk.new_lines:
+            return await self._review_chunk_batched(chunk)
+
+        return await self._run_group(self._bounded(agent, chunk) for agent in self._agents)
+
+    @staticmethod
+    async def _run_group(
+        calls: Iterable[Coroutine[Any, Any, list[ReviewComment]]],
+    ) -> list[ReviewComment]:
+        """Run one chunk's calls in a task group so a crash cancels its siblings."""
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(call) for call in calls]
+        return [comment for task in tasks for comment in task.result()]
+
+    async def _review_chunk_batched(self, chunk: CodeChunk) -> list[ReviewComment]:
+        """Review one chunk with a single fused LLM call for all prompt-capable agents."""
+        briefs: dict[str, tuple[BaseAgent, str]] = {}
+        direct: list[BaseAgent] = []
+        for agent in self._agents:
+            focus = agent.build_focus()
+            if focus is None or agent.name in briefs:
+                direct.append(agent)
+            else:
+                briefs[agent.name] = (agent, focus)
+
+        # Fusing a single review saves nothing; let the agent run normally
+        if len(briefs) < 2:
+            direct.extend(agent for agent, _ in briefs.values())
+            briefs = {}
+
+        return await self._run_group(
+            [
+                *(self._bounded(agent, chunk) for agent in direct),
+                self._analyze_fused(briefs, chunk),
+            ]
+        )
+
+    async def _analyze_fused(
+        self, briefs: dict[str, tuple[BaseAgent, str]], chunk: CodeChunk
+    ) -> list[ReviewComment]:
+        llm = self._llm
+        if not briefs or llm is None:
+            return []
+
+        agents = [agent for agent, _ in briefs.values()]
+        # The code is shown once; each review only adds what it looks for
+        sections = "\n\n".join(
+            f"### REVIEW: {name}\n{focus}" for name, (_, focus) in briefs.items()
+        )
+        keys = ", ".join(f'"{name}"' for name in briefs)
+        fused_prompt = (
+            f"{_BATCH_PROMPT_HEADER.format(section=PromptContext.from_chunk(chunk).section)}"
+            f"\n\n{sections}\n\n{_BATCH_PROMPT_FOOTER.format(keys=keys)}"
+        )
 
-        for chunk in chunks:
-            for agent in self._agents:
-                tasks.append(asyncio.create_task(agent.analyze(chunk)))
+        payload: object = None
+        try:
+            async with self._sem:
+                response = await llm.generate(
+                    fused_prompt,
+                    temperature=min(agent.temperature for agent in agents),
+                    max_tokens=sum(agent.max_tokens for agent in agents),
+                )
+            payload = orjson.loads(strip_code_fences(response))
+        except Exception as e:
+            logger.warning("orchestrator_batch_error", error=str(e), file=chunk.file_path)
 
-        results: list[list[ReviewComment]] = []
-        if tasks:
-            results = await asyncio.gather(*tasks)
+        if not isinstance(payload, dict):
+            payload = {}
 
-        all_comments: list[ReviewComment] = [comment for batch in results for comment in batch]
+        comments: list[ReviewComment] = []
+        fallback: list[BaseAgent] = []
+        for name, (agent, _) in briefs.items():
+            issues = payload.get(name)
+            if isinstance(issues, list):
+                comments.extend(agent.parse_response(issues, chunk))
+            else:
+                fallback.append(agent)
 
-        # Deduplicate comments by hash/equality
-        unique: dict[ReviewComment, ReviewComment] = {}
-        for comment in all_comments:
-            unique[comment] = comment
+        if fallback:
+            logger.info(
+                "orchestrator_batch_fallback",
+                agents=[agent.name for agent in fallback],
+                file=chunk.file_path,
+            )
+            comments.extend(
+                await self._run_group(self._bounded(agent, chunk) for agent in fallback)
+            )
 
-        return list(unique.values())
+        return comments
@@ -2,14 +2,25 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import AsyncIterable, AsyncIterator
+
 from fastapi import APIRouter, Depends, HTTPException
 
 from src.app.agents.manager import AgentOrchestrator
-from src.app.core.dependencies import get_agent_orchestrator, get_github_client
+from src.app.core.dependencies import (
+    get_agent_orchestrator,
+    get_github_client,
+    get_review_jobs,
+)
+from src.app.core.jobs import ReviewJobStore
 from src.app.core.logging_config import get_logger, log_pr_event
+from src.app.core.settings import get_settings
 from src.app.diff.parser import parse_unified_diff
+from src.app.diff.stream import iter_unified_diff
 from src.app.github.client import GitHubClient, GitHubClientError
-from src.app.models.review import ReviewRequest, ReviewResponse
+from src.app.models.code import CodeChunk
+from src.app.models.review import ReviewJob, ReviewRequest, ReviewResponse
 
 router = APIRouter(prefix="/review", tags=["review"])
 
@@ -23,6 +34,40 @@ def _parse_repo_slug(slug: str) -> tuple[str, str]:
     return owner, repo
 
 
+def _check_diff_size(size_bytes: int, lines: int) -> None:
+    """Reject diffs over the configured limits before any agent work is spent on them."""
+    settings = get_settings()
+    if size_bytes > settings.max_diff_size_bytes:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Diff exceeds maximum size of {settings.max_diff_size_bytes // 1000} KB",
+        )
+    if lines > settings.max_diff_lines:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Diff exceeds maximum of {settings.max_diff_lines} lines",
+        )
+
+
+def _check_input(request: ReviewRequest) -> None:
+    if not request.validate_input():
+        raise HTTPException(status_code=400, detail="Provide either pr_id+repo or diff")
+    if request.repo is not None:
+        _parse_repo_slug(request.repo)
+    if request.diff is not None:
+        _check_diff_size(len(request.diff.encode()), request.diff.count("\n"))
+
+
+async def _limit_diff_size(diff: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    """Pass a streamed diff through, aborting with 413 once it outgrows the limits."""
+    size_bytes = lines = 0
+    async for piece in diff:
+        size_bytes += len(piece)
+        lines += piece.count(b"\n")
+        _check_diff_size(size_bytes, lines)
+        yield piece
+
+
 @router.post("/pr", response_model=ReviewResponse)
 async def review_pull_request(
     request: ReviewRequest,
@@ -31,41 +76,102 @@ async def review_pull_request(
 ) -> ReviewResponse:
     """Review a pull request by PR identifier or raw diff input."""
 
-    if not request.validate_input():
-        raise HTTPException(status_code=400, detail="Provide either pr_id+repo or diff")
+    _check_input(request)
+    return await _run_review(request, orchestrator, github_client)
 
-    diff_source: str
-    repo_owner: str | None = None
-    repo_name: str | None = None
 
-    if request.diff:
-        diff_source = request.diff
-    else:
-        assert request.pr_id is not None  # mypy appeasement
-        assert request.repo is not None
-        repo_owner, repo_name = _parse_repo_slug(request.repo)
-        if github_client is None:
-            raise HTTPException(status_code=500, detail="GitHub client not configured")
-
-        try:
-            diff_source = await github_client.get_pull_request_diff(
-                repo_owner, repo_name, request.pr_id
-            )
-        except GitHubClientError as exc:
-            logger.error(
-                "github_diff_fetch_failed",
-                status_code=exc.status_code,
-                pr_id=request.pr_id,
-                repo=request.repo,
-            )
-            raise HTTPException(status_code=502, detail=str(exc)) from exc
+@router.post("/pr/jobs", response_model=ReviewJob, status_code=202)
+async def submit_review_job(
+    request: ReviewRequest,
+    orchestrator: AgentOrchestrator = Depends(get_agent_orchestrator),
+    github_client: GitHubClient | None = Depends(get_github_client),
+    jobs: ReviewJobStore = Depends(get_review_jobs),
+) -> ReviewJob:
+    """Queue a review and return at once; poll ``GET /review/pr/jobs/{job_id}``."""
+
+    _check_input(request)
+    # The client only wraps the app-wide pool, so it stays usable after the 202
+    return jobs.submit(_run_review(request, orchestrator, github_client))
 
-    file_diffs = parse_unified_diff(diff_source)
-    chunks = [chunk for file_diff in file_diffs for chunk in file_diff.chunks]
 
-    if request.pr_id and repo_owner and repo_name:
-        log_pr_event(request.pr_id, "review_requested", repo=request.repo, chunks=len(chunks))
+@router.get("/pr/jobs/{job_id}", response_model=ReviewJob)
+async def get_review_job(
+    job_id: str,
+    jobs: ReviewJobStore = Depends(get_review_jobs),
+) -> ReviewJob:
+    """Return the status, and once finished the result, of a queued review."""
 
-    comments = await orchestrator.review(chunks)
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown review job")
+    return job
 
-    return ReviewResponse(pr_id=request.pr_id, repo=request.repo, comments=comments)
+
+async def _run_review(
+    request: ReviewRequest,
+    orchestrator: AgentOrchestrator,
+    github_client: GitHubClient | None,
+) -> ReviewResponse:
+    if request.diff:
+        chunks = [
+            chunk for file_diff in parse_unified_diff(request.diff) for chunk in file_diff.chunks
+        ]
+        comments = await orchestrator.review(chunks)
+        return ReviewResponse(pr_id=request.pr_id, repo=request.repo, comments=comments)
+
+    assert request.pr_id is not None  # mypy appeasement
+    assert request.repo is not None
+    repo_owner, repo_name = _parse_repo_slug(request.repo)
+    if github_client is None:
+        raise HTTPException(status_code=500, detail="GitHub client not configured")
+
+    # Agents start on the first parsed chunks while the rest of the diff streams in
+    queue: asyncio.Queue[CodeChunk | None] = asyncio.Queue()
+    fetch_error: GitHubClientError | None = None
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(
+                _stream_chunks(
+                    _limit_diff_size(
+                        github_client.stream_pull_request_diff(repo_owner, repo_name, request.pr_id)
+                    ),
+                    queue,
+                    pr_id=request.pr_id,
+                    repo=request.repo,
+                )
+            )
+            consumer = tg.create_task(orchestrator.review_stream(queue))
+    except* HTTPException as rejected:
+        raise rejected.exceptions[0] from None
+    except* GitHubClientError as failures:
+        fetch_error = failures.exceptions[0]  # type: ignore[assignment]
+
+    if fetch_error is not None:
+        logger.error(
+            "github_diff_fetch_failed",
+            status_code=fetch_error.status_code,
+            pr_id=request.pr_id,
+            repo=request.repo,
+        )
+        raise HTTPException(status_code=502, detail=str(fetch_error)) from fetch_error
+
+    return ReviewResponse(pr_id=request.pr_id, repo=request.repo, comments=consumer.result())
+
+
+async def _stream_chunks(
+    diff: AsyncIterable[bytes],
+    queue: asyncio.Queue[CodeChunk | None],
+    *,
+    pr_id: int,
+    repo: str,
+) -> None:
+    """Parse a streamed diff onto ``queue``, always ending it with ``None``."""
+    count = 0
+    try:
+        async for file_diff in iter_unified_diff(diff):
+            for chunk in file_diff.chunks:
+                queue.put_nowait(chunk)
+            count += len(file_diff.chunks)
+    finally:
+        queue.put_nowait(None)
+    log_pr_event(pr_id, "review_requested", repo=repo, chunks=count)
@@ -1,16 +1,21 @@
 """Dependency injection providers."""
 
-from collections.abc import AsyncIterator
 from functools import lru_cache
 
+import httpx
+from fastapi import Request
+
 from src.app.agents.logic import LogicAgent
 from src.app.agents.manager import AgentOrchestrator
 from src.app.agents.performance import PerformanceAgent
 from src.app.agents.readability import ReadabilityAgent
 from src.app.agents.security import SecurityAgent
-from src.app.core.settings import get_settings
-from src.app.github.client import GitHubClient
-from src.app.llm import LLMClient, LLMConfig
+from src.app.core.jobs import ReviewJobStore
+from src.app.core.settings import Settings, get_settings
+from src.app.github.cache import ETagCache
+from src.app.github.client import DEFAULT_LIMITS, HTTP2_AVAILABLE, GitHubClient
+from src.app.github.ratelimit import RateLimiter
+from src.app.llm import LLMClient, LLMConfig, ResponseCache
 
 
 @lru_cache
@@ -22,29 +27,114 @@ def get_llm_client() -> LLMClient:
         base_url=settings.llm_base_url,
         model=settings.llm_model_name,
         timeout=settings.llm_timeout,
+        max_retries=settings.llm_max_retries,
+        keep_alive=settings.llm_keep_alive,
+        # Every permitted in-flight request keeps a warm connection
+        max_connections=max(settings.llm_concurrency, 1),
+    )
+    cache = (
+        ResponseCache(max_entries=settings.llm_cache_size, ttl=settings.llm_cache_ttl)
+        if settings.llm_cache_size > 0
+        else None
+    )
+    return LLMClient(config=config, cache=cache)
+
+
+async def close_llm_client() -> None:
+    """Close the shared LLM connection pool if it was created; the lifespan calls this."""
+
+    if get_llm_client.cache_info().currsize:
+        await get_llm_client().close()
+    # Drop the closed client and the orchestrator bound to it so a restarted app rebuilds both
+    get_agent_orchestrator.cache_clear()
+    get_llm_client.cache_clear()
+
+
+@lru_cache
+def _get_etag_cache(
+    path: str, max_entries: int, max_bytes: int, max_body_bytes: int, ttl: float
+) -> ETagCache:
+    """Share one ETag cache per path so it is loaded from disk only once."""
+
+    return ETagCache(
+        path,
+        max_entries=max_entries,
+        max_bytes=max_bytes,
+        max_body_bytes=max_body_bytes,
+        ttl=ttl,
     )
-    return LLMClient(config=config)
 
 
-async def get_github_client() -> AsyncIterator[GitHubClient]:
-    """Provide a configured GitHub client for request scope."""
+def _etag_cache_for(settings: Settings) -> ETagCache | None:
+    if not settings.github_etag_cache_path:
+        return None
+    return _get_etag_cache(
+        settings.github_etag_cache_path,
+        settings.github_etag_cache_size,
+        settings.github_etag_cache_max_bytes,
+        settings.github_etag_cache_max_body_bytes,
+        settings.github_etag_cache_ttl,
+    )
+
+
+async def close_github_caches() -> None:
+    """Persist the shared ETag cache and drop it and the rate limiter; the lifespan calls this."""
+
+    if _get_etag_cache.cache_info().currsize and (cache := _etag_cache_for(get_settings())):
+        await cache.aflush()
+    _get_etag_cache.cache_clear()
+    # Its lock and backoff state belong to this app's event loop
+    _get_rate_limiter.cache_clear()
+
+
+@lru_cache
+def _get_rate_limiter(max_retries: int) -> RateLimiter:
+    """Share one rate limiter so pacing survives the per-request GitHub clients."""
+
+    return RateLimiter(max_retries=max_retries)
+
+
+def create_github_http_client() -> httpx.AsyncClient:
+    """Create the app-wide GitHub connection pool; the lifespan owns and closes it."""
 
     settings = get_settings()
-    client = GitHubClient(
-        token=settings.github_token,
+    return httpx.AsyncClient(
         base_url=settings.github_api_url,
         timeout=settings.github_timeout,
+        limits=DEFAULT_LIMITS,
+        http2=HTTP2_AVAILABLE,
+    )
+
+
+def get_github_client(request: Request) -> GitHubClient:
+    """Provide a configured GitHub client backed by the shared connection pool."""
+
+    settings = get_settings()
+    return GitHubClient.from_shared(
+        request.app.state.github_http,
+        token=settings.github_token,
         user_agent=settings.github_user_agent,
+        etag_cache=_etag_cache_for(settings),
+        rate_limiter=_get_rate_limiter(settings.github_max_retries),
     )
-    try:
-        yield client
-    finally:
-        await client.aclose()
 
 
+@lru_cache
+def get_review_jobs() -> ReviewJobStore:
+    """Get the process-wide store of queued review jobs."""
+
+    return ReviewJobStore()
+
+
+@lru_cache
 def get_agent_orchestrator() -> AgentOrchestrator:
-    """Construct an orchestrator wired with the default agent set."""
+    """Get the cached orchestrator wired with the default agent set.
+
+    Sharing one instance makes ``llm_concurrency`` a process-wide cap on
+    in-flight LLM calls instead of a per-request one.
+    """
 
+    settings = get_settings()
     llm_client = get_llm_client()
     agents = [
         LogicAgent(llm=llm_client),
@@ -52,4 +142,8 @@ def get_agent_orchestrator() -> AgentOrchestrator:
         PerformanceAgent(llm=llm_client),
         SecurityAgent(llm=llm_client),
     ]
-    return AgentOrchestrator(agents)
+    return AgentOrchestrator(
+        agents,
+        llm=llm_client if settings.batch_agent_prompts else None,
+        concurrency=settings.llm_concurrency,
+    )
@@ -0,0 +1,77 @@
+"""In-process queue for reviews that outlive their HTTP request."""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+from collections import OrderedDict
+from collections.abc import Coroutine
+from typing import Any
+
+from fastapi import HTTPException
+
+from src.app.core.logging_config import get_logger
+from src.app.models.base import JobStatus
+from src.app.models.review import ReviewJob, ReviewResponse
+
+logger = get_logger(__name__)
+
+
+class ReviewJobStore:
+    """Runs submitted reviews as background tasks and keeps their outcome.
+
+    Submitting returns at once, so a slow multi-agent review no longer holds
+    its HTTP connection open. Only the most recent ``max_jobs`` finished jobs
+    are retained; running jobs are never evicted.
+    """
+
+    def __init__(self, max_jobs: int = 1000) -> None:
+        self._max_jobs = max_jobs
+        self._jobs: OrderedDict[str, ReviewJob] = OrderedDict()
+        # Strong references so the event loop does not drop running tasks
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def submit(self, review: Coroutine[Any, Any, ReviewResponse]) -> ReviewJob:
+        """Start ``review`` in the background and return its pending job."""
+        job = ReviewJob(job_id=uuid.uuid4().hex)
+        self._jobs[job.job_id] = job
+        self._evict()
+
+        task = asyncio.create_task(self._run(job, review))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    def get(self, job_id: str) -> ReviewJob | None:
+        return self._jobs.get(job_id)
+
+    async def aclose(self) -> None:
+        """Cancel running reviews and wait for them before their clients close."""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(self, job: ReviewJob, review: Coroutine[Any, Any, ReviewResponse]) -> None:
+        job.status = JobStatus.RUNNING
+        try:
+            job.result = await review
+        except asyncio.CancelledError:
+            job.status, job.error = JobStatus.FAILED, "Review cancelled at shutdown"
+            raise
+        except HTTPException as exc:
+            job.status, job.error = JobStatus.FAILED, str(exc.detail)
+        except Exception as exc:
+            logger.error("review_job_failed", job_id=job.job_id, error=str(exc))
+            job.status, job.error = JobStatus.FAILED, str(exc)
+        else:
+            job.status = JobStatus.COMPLETED
+
+    def _evict(self) -> None:
+        finished = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.status in (JobStatus.COMPLETED, JobStatus.FAILED)
+        ]
+        for job_id in finished[: max(0, len(self._jobs) - self._max_jobs)]:
+            del self._jobs[job_id]
@@ -1,15 +1,73 @@
 """Structured logging configuration."""
 
+import atexit
 import logging
+import queue
 import sys
-from typing import Any
+import threading
+from typing import Any, BinaryIO, cast
 
+import orjson
 import structlog
 from structlog.types import FilteringBoundLogger
 
 from .settings import get_settings
 
 
+class _BackgroundWriter:
+    """File-like log sink whose writes happen on a dedicated thread.
+
+    ``write`` only enqueues, so request handlers never block on stdout. The
+    thread joins everything queued since its last pass into one write, turning
+    bursts of records into a single syscall.
+    """
+
+    def __init__(self, stream: BinaryIO) -> None:
+        self._stream = stream
+        self._queue: queue.SimpleQueue[bytes | None] = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, data: bytes) -> None:
+        self._queue.put(data)
+
+    def flush(self) -> None:
+        """Nothing to do: the writer thread flushes after every batch."""
+
+    def close(self) -> None:
+        """Write out pending records and stop the thread."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def _run(self) -> None:
+        pending = self._queue
+        while True:
+            batch = [pending.get()]
+            while not pending.empty():
+                batch.append(pending.get_nowait())
+            try:
+                self._stream.write(b"".join(item for item in batch if item is not None))
+                self._stream.flush()
+            except (OSError, ValueError):
+                # stdout went away (closed pipe); drop the records rather than crash
+                pass
+            if None in batch:
+                return
+
+
+_stdout_writer: _BackgroundWriter | None = None
+
+
+def _get_stdout_writer() -> _BackgroundWriter:
+    """Return the process-wide stdout writer, starting it on first use."""
+    global _stdout_writer
+    if _stdout_writer is None:
+        _stdout_writer = _BackgroundWriter(sys.stdout.buffer)
+    return _stdout_writer
+
+
 def setup_logging() -> FilteringBoundLogger:
     """Configure structured logging with structlog."""
     settings = get_settings()
@@ -27,23 +85,24 @@ def setup_logging() -> FilteringBoundLogger:
     # Shared processors for both dev and prod
     shared_processors = [
         structlog.contextvars.merge_contextvars,
-        structlog.stdlib.add_log_level,
-        structlog.stdlib.add_logger_name,
+        structlog.processors.add_log_level,
         structlog.processors.TimeStamper(fmt="iso"),
         structlog.processors.StackInfoRenderer(),
     ]
 
     if settings.log_format == "json":
-        # Production JSON logging
+        # Production JSON logging: orjson renders bytes that a background thread
+        # writes to stdout in batches, skipping stdlib logging and the str round-trip
         structlog.configure(
             processors=shared_processors
             + [
                 structlog.processors.format_exc_info,
-                structlog.processors.JSONRenderer(),
+                structlog.processors.JSONRenderer(serializer=orjson.dumps),
             ],
-            wrapper_class=structlog.stdlib.BoundLogger,
+            wrapper_class=structlog.make_filtering_bound_logger(log_level),
             context_class=dict,
-            logger_factory=structlog.stdlib.LoggerFactory(),
+            # BytesLogger only calls write() and flush(), which the writer provides
+            logger_factory=structlog.BytesLoggerFactory(cast(BinaryIO, _get_stdout_writer())),
             cache_logger_on_first_use=True,
         )
     else:
@@ -64,22 +123,25 @@ def setup_logging() -> FilteringBoundLogger:
 
 def get_logger(name: str) -> FilteringBoundLogger:
     """Get a logger instance."""
-    return structlog.get_logger(name)
+    # Bound explicitly: the bytes logger factory does not record logger names
+    return structlog.get_logger(name, logger_name=name)
+
+
+# Shared by the helpers below; the lazy proxy picks up setup_logging's
+# configuration on first use and is cached from then on
+_module_logger = get_logger(__name__)
 
 
 def log_request(request_id: str, **extra: Any) -> None:
     """Log request with context."""
-    logger = get_logger(__name__)
-    logger.info("request", request_id=request_id, **extra)
+    _module_logger.info("request", request_id=request_id, **extra)
 
 
 def log_pr_event(pr_id: int, event_name: str, **extra: Any) -> None:
     """Log PR-related event with context."""
-    logger = get_logger(__name__)
-    logger.info("pr_event", pr_id=pr_id, event_name=event_name, **extra)
+    _module_logger.info("pr_event", pr_id=pr_id, event_name=event_name, **extra)
 
 
 def log_agent_execution(agent_name: str, duration_ms: float, **extra: Any) -> None:
     """Log agent execution metrics."""
-    logger = get_logger(__name__)
-    logger.info("agent_execution", agent=agent_name, duration_ms=duration_ms, **extra)
+    _module_logger.info("agent_execution", agent=agent_name, duration_ms=duration_ms, **extra)
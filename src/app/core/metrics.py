@@ -0,0 +1,40 @@
+"""Prometheus exposition with a short-lived render cache."""
+
+from __future__ import annotations
+
+import os
+import time
+
+from prometheus_client import CollectorRegistry, generate_latest, multiprocess
+
+
+class MetricsCache:
+    """Render the Prometheus exposition at most once per ``ttl`` seconds.
+
+    Walking every collector on each scrape costs CPU that request handlers
+    compete for; scrapes inside the window get the previous payload. ``render``
+    never awaits, so concurrent scrapes cannot interleave and need no lock.
+    A ``ttl`` of 0 renders on every call.
+    """
+
+    def __init__(self, registry: CollectorRegistry, ttl: float = 10.0) -> None:
+        self._registry = registry
+        self._ttl = ttl
+        self._payload: bytes | None = None
+        self._rendered_at = 0.0
+
+    def render(self) -> bytes:
+        now = time.monotonic()
+        if self._payload is None or now - self._rendered_at >= self._ttl:
+            self._payload = generate_latest(self._collect_from())
+            self._rendered_at = now
+        return self._payload
+
+    def _collect_from(self) -> CollectorRegistry:
+        # Same multi-process handling as the instrumentator's own endpoint
+        if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+            registry = CollectorRegistry()
+            # prometheus_client ships this constructor without annotations
+            multiprocess.MultiProcessCollector(registry)  # type: ignore[no-untyped-call]
+            return registry
+        return self._registry
@@ -1,6 +1,7 @@
 """Application settings and configuration."""
 
 from functools import lru_cache
+from typing import ClassVar
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -26,12 +27,23 @@ class Settings(BaseSettings):
     github_api_url: str = "https://api.github.com"
     github_timeout: float = 15.0
     github_user_agent: str = "Lyzer-PR-Review-Agent/0.1.0"
+    github_etag_cache_path: str | None = None  # e.g. ~/.cache/lyzer/etag_cache.json
+    github_etag_cache_size: int = 1024  # Responses kept in the ETag cache file
+    github_etag_cache_max_bytes: int = 64 * 1024 * 1024  # Total body bytes kept in the file
+    github_etag_cache_max_body_bytes: int = 4 * 1024 * 1024  # Larger bodies are never cached
+    github_etag_cache_ttl: float = 7 * 24 * 3600.0  # Seconds an entry lives without revalidation
+    github_max_retries: int = 3  # Retries on throttling 403/429 and transient 5xx
 
     # LLM / AI
     # Ollama (local, default)
     llm_base_url: str = "http://ollama:11434"
     llm_model_name: str = "qwen2.5-coder:3b"
     llm_timeout: float = 60.0
+    llm_concurrency: int = 8  # Max in-flight LLM requests across all reviews
+    llm_max_retries: int = 3  # Retries on 429/503 (honours Retry-After)
+    llm_keep_alive: str | None = "30m"  # Ollama keep_alive; keeps the model loaded between reviews
+    llm_cache_size: int = 1024  # Cached completions kept in memory (0 disables)
+    llm_cache_ttl: float = 7 * 24 * 3600.0  # Seconds a cached completion stays valid
     # Cloud LLMs (optional, for comparison)
     openai_api_key: str | None = None
     openai_model: str = "gpt-4"
@@ -42,52 +54,63 @@ class Settings(BaseSettings):
     max_chunk_size: int = 1000
     reasoning_depth: int = 3
     enable_parallel_agents: bool = True
+    batch_agent_prompts: bool = True  # Fuse all agent prompts into one LLM call per chunk
 
     # Diff Processing
     max_diff_size_bytes: int = 500000  # 500KB limit
     max_diff_lines: int = 10000  # Maximum lines in diff
-    supported_languages: list[str] = [
-        "python",
-        "javascript",
-        "typescript",
-        "java",
-        "go",
-        "rust",
-        "c",
-        "cpp",
-        "csharp",
-        "ruby",
-        "php",
-        "swift",
-        "kotlin",
-    ]  # Languages to review
-    supported_extensions: list[str] = [
-        ".py",
-        ".js",
-        ".ts",
-        ".jsx",
-        ".tsx",
-        ".java",
-        ".go",
-        ".rs",
-        ".c",
-        ".cpp",
-        ".cc",
-        ".h",
-        ".hpp",
-        ".cs",
-        ".rb",
-        ".php",
-        ".swift",
-        ".kt",
-    ]
+    # Fixed review scope; class-level so lookups skip validation and env parsing
+    supported_languages: ClassVar[frozenset[str]] = frozenset(
+        {
+            "python",
+            "javascript",
+            "typescript",
+            "java",
+            "go",
+            "rust",
+            "c",
+            "cpp",
+            "csharp",
+            "ruby",
+            "php",
+            "swift",
+            "kotlin",
+        }
+    )  # Languages to review
+    supported_extensions: ClassVar[frozenset[str]] = frozenset(
+        {
+            ".py",
+            ".js",
+            ".ts",
+            ".jsx",
+            ".tsx",
+            ".java",
+            ".go",
+            ".rs",
+            ".c",
+            ".cpp",
+            ".cc",
+            ".h",
+            ".hpp",
+            ".cs",
+            ".rb",
+            ".php",
+            ".swift",
+            ".kt",
+        }
+    )
 
     # Monitoring
     enable_metrics: bool = True
     metrics_port: int = 9090
+    metrics_cache_ttl: float = 10.0  # Seconds a rendered /metrics payload is reused (0 disables)
 
     model_config = SettingsConfigDict(
-        env_file=".env", env_file_encoding="utf-8", case_sensitive=False, extra="ignore"
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore",
+        frozen=True,
     )
 
 
@@ -3,12 +3,16 @@
 This module is intentionally small and focused: it converts a raw unified diff
 string into a list of FileDiff/CodeChunk models that the agent layer can
 consume. It does not know anything about GitHub or HTTP.
+
+The module is fully annotated and free of closures so the Docker build can
+compile it with mypyc; the pure-Python source remains the fallback.
 """
 
 from __future__ import annotations
 
+import re
 from collections.abc import Iterable
-from pathlib import Path
+from dataclasses import dataclass, field
 
 from src.app.core.settings import get_settings
 from src.app.models.base import Language
@@ -34,22 +38,209 @@ _LANGUAGE_MAP: dict[str, Language] = {
 }
 
 
+# New-file start line of a hunk header such as ``@@ -10,7 +12,9 @@ def foo():``
+_HUNK_RE = re.compile(r"@@ -\d+(?:,\d+)? \+(\d+)")
+
+
+_DEV_NULL = "/dev/null"
+_DEV_NULL_ALIASES = frozenset({_DEV_NULL, "dev/null"})
+_SIDE_PREFIXES = ("a/", "b/")
+
+
 def _normalize_diff_path(path: str | None) -> str | None:
     if path is None:
         return None
+    # Kept: non-git diffs may pad header paths with trailing whitespace
     trimmed = path.strip()
-    if trimmed in {"/dev/null", "dev/null"}:
-        return "/dev/null"
-    if trimmed.startswith("a/") or trimmed.startswith("b/"):
+    if trimmed in _DEV_NULL_ALIASES:
+        return _DEV_NULL
+    if trimmed.startswith(_SIDE_PREFIXES):
         return trimmed[2:]
     return trimmed
 
 
+_BINARY_EXTENSIONS = frozenset(
+    {
+        ".png",
+        ".jpg",
+        ".jpeg",
+        ".gif",
+        ".ico",
+        ".pdf",
+        ".zip",
+        ".tar",
+        ".gz",
+        ".exe",
+        ".dll",
+        ".so",
+        ".dylib",
+    }
+)
+
+
+def _suffix(path: str) -> str:
+    """Lower-cased extension of the last path component, matching ``Path.suffix``.
+
+    Slicing the string avoids building a ``Path`` for every file in the diff.
+    """
+    name = path[path.rfind("/") + 1 :]
+    dot = name.rfind(".")
+    if dot <= 0 or dot == len(name) - 1:
+        return ""
+    return name[dot:].lower()
+
+
 def _detect_language(path: str | None) -> Language:
-    if not path or path == "/dev/null":
+    if not path or path == _DEV_NULL:
         return Language.UNKNOWN
-    ext = Path(path).suffix.lower()
-    return _LANGUAGE_MAP.get(ext, Language.UNKNOWN)
+    return _LANGUAGE_MAP.get(_suffix(path), Language.UNKNOWN)
+
+
+@dataclass(slots=True)
+class _ParseState:
+    """Mutable cursor for ``parse_unified_diff``; one instance per call."""
+
+    current_file: FileDiff | None = None
+    original_lines: list[str] = field(default_factory=list)
+    new_lines: list[str] = field(default_factory=list)
+    changed_line_indices: list[int] = field(default_factory=list)
+    hunk_start: int | None = None
+    additions: int = 0
+    deletions: int = 0
+    old_path: str | None = None
+    new_path: str | None = None
+    file_lines: list[str] | None = None
+
+
+def _flush_chunk(state: _ParseState) -> None:
+    current_file = state.current_file
+    if current_file is None or state.hunk_start is None:
+        return
+    if not state.original_lines and not state.new_lines:
+        return
+
+    line_span = max(len(state.original_lines), len(state.new_lines))
+    # Validation copies the line lists into the chunk; the buffers are replaced
+    # below rather than cleared so no chunk ever shares a list with the parser
+    chunk = CodeChunk(
+        file_path=current_file.file_path,
+        language=current_file.language,
+        original_lines=state.original_lines,
+        new_lines=state.new_lines,
+        changed_line_indices=state.changed_line_indices,
+        start_line=state.hunk_start,
+        end_line=state.hunk_start + line_span - 1,
+    )
+    current_file.chunks.append(chunk)
+
+    state.original_lines = []
+    state.new_lines = []
+    state.changed_line_indices = []
+    state.hunk_start = None
+
+
+def _finalize_file(state: _ParseState, file_diffs: list[FileDiff]) -> None:
+    _flush_chunk(state)
+    current_file = state.current_file
+    if current_file is not None:
+        current_file.additions = state.additions
+        current_file.deletions = state.deletions
+        if state.file_lines:
+            current_file.raw_diff = "\n".join(state.file_lines)
+        file_diffs.append(current_file)
+
+        state.current_file = None
+        state.additions = 0
+        state.deletions = 0
+
+    state.file_lines = None
+    state.old_path = None
+    state.new_path = None
+
+
+def _start_file(state: _ParseState, new_path: str | None) -> None:
+    """Open a FileDiff once both ``---`` and ``+++`` headers have been seen."""
+    state.new_path = new_path
+    old_path = state.old_path
+
+    if old_path == _DEV_NULL:
+        file_path = new_path or ""
+        status = "added"
+    elif new_path == _DEV_NULL:
+        file_path = old_path or ""
+        status = "deleted"
+    else:
+        file_path = new_path or old_path or ""
+        if old_path and new_path and old_path != new_path:
+            status = "renamed"
+        else:
+            status = "modified"
+
+    state.current_file = FileDiff(
+        file_path=file_path,
+        language=_detect_language(file_path),
+        status=status,
+        additions=0,
+        deletions=0,
+        chunks=[],
+        raw_diff="",
+    )
+    state.additions = 0
+    state.deletions = 0
+
+
+def _start_hunk(state: _ParseState, line: str) -> None:
+    _flush_chunk(state)
+    match = _HUNK_RE.match(line)
+    if match is None:
+        state.hunk_start = None
+    else:
+        parsed_line = int(match.group(1))
+        state.hunk_start = parsed_line if parsed_line > 0 else 1
+    state.original_lines = []
+    state.new_lines = []
+    state.changed_line_indices = []
+
+
+def _feed_lines(state: _ParseState, lines: Iterable[str], file_diffs: list[FileDiff]) -> None:
+    """Advance the parser over ``lines``, appending every file that completes."""
+
+    # Dispatch on the first character so the startswith calls only run when it
+    # matches: a "diff --git " header starts the next file before the line is
+    # recorded, then context/added/removed lines are told apart by " ", "+", "-"
+    for line in lines:
+        first = line[:1]
+        if first == "d" and line.startswith("diff --git "):
+            _finalize_file(state, file_diffs)
+            state.file_lines = [line]
+            continue
+
+        if state.file_lines is not None:
+            state.file_lines.append(line)
+
+        if first == " ":
+            if state.hunk_start is not None and state.current_file is not None:
+                text = line[1:]
+                state.original_lines.append(text)
+                state.new_lines.append(text)
+        elif first == "+":
+            if line.startswith("+++"):
+                if line.startswith("+++ "):
+                    _start_file(state, _normalize_diff_path(line[4:]))
+            elif state.hunk_start is not None and state.current_file is not None:
+                state.changed_line_indices.append(len(state.new_lines))
+                state.new_lines.append(line[1:])
+                state.additions += 1
+        elif first == "-":
+            if line.startswith("---"):
+                if line.startswith("--- "):
+                    state.old_path = _normalize_diff_path(line[4:])
+            elif state.hunk_start is not None and state.current_file is not None:
+                state.original_lines.append(line[1:])
+                state.deletions += 1
+        elif first == "@":
+            if line.startswith("@@ ") and state.current_file is not None:
+                _start_hunk(state, line)
 
 
 def parse_unified_diff(raw_diff: str) -> list[FileDiff]:
@@ -69,145 +260,44 @@ def parse_unified_diff(raw_diff: str) -> list[FileDiff]:
         return []
 
     file_diffs: list[FileDiff] = []
+    state = _ParseState()
+    _feed_lines(state, raw_diff.splitlines(), file_diffs)
+    _finalize_file(state, file_diffs)
 
-    current_file: FileDiff | None = None
-    original_lines: list[str] = []
-    new_lines: list[str] = []
-    hunk_start_line_new: int | None = None
-    current_additions = 0
-    current_deletions = 0
-    old_path: str | None = None
-    new_path: str | None = None
-    file_lines: list[str] | None = None
-
-    def _flush_chunk() -> None:
-        nonlocal original_lines, new_lines, hunk_start_line_new, current_file
-        if current_file is None or hunk_start_line_new is None:
-            return
-        if not original_lines and not new_lines:
-            return
-
-        line_span = max(len(original_lines), len(new_lines))
-        end_line = hunk_start_line_new + line_span - 1
-        chunk = CodeChunk(
-            file_path=current_file.file_path,
-            language=current_file.language,
-            original_lines=list(original_lines),
-            new_lines=list(new_lines),
-            start_line=hunk_start_line_new,
-            end_line=end_line,
-        )
-        current_file.chunks.append(chunk)
-
-        original_lines = []
-        new_lines = []
-        hunk_start_line_new = None
-
-    def _finalize_file() -> None:
-        nonlocal current_file, current_additions, current_deletions, file_lines, old_path, new_path
-        _flush_chunk()
-        if current_file is None:
-            file_lines = None
-            old_path = None
-            new_path = None
-            return
-
-        current_file.additions = current_additions
-        current_file.deletions = current_deletions
-        if file_lines:
-            current_file.raw_diff = "\n".join(file_lines)
-        file_diffs.append(current_file)
-
-        current_file = None
-        current_additions = 0
-        current_deletions = 0
-        file_lines = None
-        old_path = None
-        new_path = None
-
-    lines: Iterable[str] = raw_diff.splitlines()
-    for line in lines:
-        if line.startswith("diff --git "):
-            _finalize_file()
-            file_lines = [line]
-            continue
-
-        if file_lines is not None:
-            file_lines.append(line)
-
-        if line.startswith("--- "):
-            old_path = _normalize_diff_path(line[4:])
-            continue
-
-        if line.startswith("+++ "):
-            new_path = _normalize_diff_path(line[4:])
-
-            normalized_old = old_path
-            normalized_new = new_path
-
-            if normalized_old == "/dev/null":
-                file_path = normalized_new or ""
-                status = "added"
-            elif normalized_new == "/dev/null":
-                file_path = normalized_old or ""
-                status = "deleted"
-            else:
-                file_path = normalized_new or normalized_old or ""
-                if normalized_old and normalized_new and normalized_old != normalized_new:
-                    status = "renamed"
-                else:
-                    status = "modified"
-
-            language = _detect_language(file_path)
-            current_file = FileDiff(
-                file_path=file_path,
-                language=language,
-                status=status,
-                additions=0,
-                deletions=0,
-                chunks=[],
-                raw_diff="",
-            )
-            current_additions = 0
-            current_deletions = 0
-            continue
-
-        if line.startswith("@@ ") and current_file is not None:
-            _flush_chunk()
-            try:
-                header = line.split("@@")[1].strip()
-                parts = header.split()
-                new_part = next(p for p in parts if p.startswith("+"))
-                plus_range = new_part[1:]
-                if "," in plus_range:
-                    start_str, _ = plus_range.split(",", 1)
-                else:
-                    start_str = plus_range
-                parsed_line = int(start_str) if start_str else 0
-                hunk_start_line_new = parsed_line if parsed_line > 0 else 1
-            except Exception:
-                hunk_start_line_new = None
-            original_lines = []
-            new_lines = []
-            continue
+    return file_diffs
 
-        if current_file is None or hunk_start_line_new is None:
-            continue
 
-        if line.startswith("+") and not line.startswith("+++"):
-            new_lines.append(line[1:])
-            current_additions += 1
-        elif line.startswith("-") and not line.startswith("---"):
-            original_lines.append(line[1:])
-            current_deletions += 1
-        elif line.startswith(" "):
-            text = line[1:]
-            original_lines.append(text)
-            new_lines.append(text)
+class IncrementalDiffParser:
+    """Parse a unified diff fed in arbitrary byte chunks.
 
-    _finalize_file()
+    ``feed`` returns every FileDiff completed by the data so far, so only the
+    current file and one partial line are held in memory; ``close`` flushes the
+    rest. The result matches ``parse_unified_diff`` on the decoded text.
+    """
 
-    return file_diffs
+    def __init__(self) -> None:
+        self._state = _ParseState()
+        self._pending = bytearray()
+
+    def feed(self, data: bytes) -> list[FileDiff]:
+        self._pending += data
+        cut = self._pending.rfind(b"\n") + 1
+        completed: list[FileDiff] = []
+        if cut:
+            # Cutting after a newline keeps multi-byte UTF-8 sequences intact
+            text = self._pending[:cut].decode("utf-8", errors="replace")
+            del self._pending[:cut]
+            _feed_lines(self._state, text.splitlines(), completed)
+        return completed
+
+    def close(self) -> list[FileDiff]:
+        completed: list[FileDiff] = []
+        if self._pending:
+            text = self._pending.decode("utf-8", errors="replace")
+            self._pending.clear()
+            _feed_lines(self._state, text.splitlines(), completed)
+        _finalize_file(self._state, completed)
+        return completed
 
 
 def filter_supported_files(
@@ -218,35 +308,20 @@ def filter_supported_files(
     Returns:
         Tuple of (supported_files, ignored_files)
     """
-    settings = get_settings()
+    supported_extensions = get_settings().supported_extensions
     supported = []
     ignored = []
 
     for file_diff in file_diffs:
+        ext = _suffix(file_diff.file_path)
+
         # Check for binary files (common markers)
-        if file_diff.file_path.endswith(
-            (
-                ".png",
-                ".jpg",
-                ".jpeg",
-                ".gif",
-                ".ico",
-                ".pdf",
-                ".zip",
-                ".tar",
-                ".gz",
-                ".exe",
-                ".dll",
-                ".so",
-                ".dylib",
-            )
-        ):
+        if ext in _BINARY_EXTENSIONS:
             ignored.append(f"{file_diff.file_path} (binary)")
             continue
 
         # Check extension
-        ext = Path(file_diff.file_path).suffix.lower()
-        if ext and ext not in settings.supported_extensions:
+        if ext and ext not in supported_extensions:
             ignored.append(f"{file_diff.file_path} (unsupported: {ext})")
             continue
 
@@ -0,0 +1,22 @@
+"""Async adapter feeding streamed diff bodies into the incremental parser.
+
+Kept out of ``parser.py`` because mypyc cannot compile async generators.
+"""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterable, AsyncIterator
+
+from src.app.diff.parser import IncrementalDiffParser
+from src.app.models.code import FileDiff
+
+
+async def iter_unified_diff(chunks: AsyncIterable[bytes]) -> AsyncIterator[FileDiff]:
+    """Yield each FileDiff as soon as the streamed diff completes it."""
+
+    parser = IncrementalDiffParser()
+    async for chunk in chunks:
+        for file_diff in parser.feed(chunk):
+            yield file_diff
+    for file_diff in parser.close():
+        yield file_diff
@@ -1,5 +1,13 @@
 """GitHub integration package."""
 
-from .client import GitHubClient, GitHubClientError
+from .cache import ETagCache
+from .client import GitHubClient, GitHubClientError, PullRequestBundle
+from .ratelimit import RateLimiter
 
-__all__ = ["GitHubClient", "GitHubClientError"]
+__all__ = [
+    "ETagCache",
+    "GitHubClient",
+    "GitHubClientError",
+    "PullRequestBundle",
+    "RateLimiter",
+]
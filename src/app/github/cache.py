@@ -0,0 +1,188 @@
+"""On-disk ETag cache for conditional GitHub requests."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+DEFAULT_ETAG_CACHE_PATH = Path("~/.cache/lyzer/etag_cache.json").expanduser()
+# Bodies are full diffs and file lists, so keep the file to a bounded size
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Larger bodies are served but never stored, so one huge diff cannot evict the rest
+DEFAULT_MAX_BODY_BYTES = 4 * 1024 * 1024
+# Seven days, matching the LLM response cache
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600.0
+
+
+@dataclass(slots=True)
+class CachedResponse:
+    """Validators and body of a previously successful GET."""
+
+    body: str
+    content_type: str | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+class ETagCache:
+    """Bounded JSON file mapping canonical request keys to their last 200 response.
+
+    GitHub answers ``If-None-Match``/``If-Modified-Since`` requests for unchanged
+    resources with a body-less 304 that does not count against the primary rate
+    limit, so replaying the stored body is both faster and cheaper.
+
+    Entries expire ``ttl`` seconds after they were last stored or revalidated,
+    and the least recently used are evicted beyond ``max_entries`` or once the
+    bodies together exceed ``max_bytes``. Bodies over ``max_body_bytes`` are not
+    stored at all. Changes stay
+    in memory until ``flush``/``aflush``; the file is replaced atomically through
+    a uniquely named temporary file, so processes sharing a path never clobber a
+    half-written file.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = DEFAULT_ETAG_CACHE_PATH,
+        *,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_body_bytes: int = DEFAULT_MAX_BODY_BYTES,
+        ttl: float = DEFAULT_TTL_SECONDS,
+    ) -> None:
+        self._path = Path(path).expanduser()
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._max_body_bytes = min(max_body_bytes, max_bytes)
+        self._ttl = ttl
+        self._entries: OrderedDict[str, dict[str, Any]] | None = None
+        self._total_bytes = 0
+        self._dirty = False
+
+    @property
+    def max_body_bytes(self) -> int:
+        """Size of the largest body this cache will store."""
+        return self._max_body_bytes
+
+    def _load(self) -> OrderedDict[str, dict[str, Any]]:
+        if self._entries is None:
+            try:
+                data = json.loads(self._path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                data = {}
+            self._entries = OrderedDict(data if isinstance(data, dict) else {})
+            self._total_bytes = sum(map(_entry_size, self._entries.values()))
+            # The limits may have shrunk since the file was written
+            self._evict()
+        return self._entries
+
+    def _discard(self, key: str) -> None:
+        entries = self._load()
+        self._total_bytes -= _entry_size(entries.pop(key))
+        self._dirty = True
+
+    def _evict(self) -> None:
+        entries = self._entries
+        assert entries is not None
+        while entries and (len(entries) > self._max_entries or self._total_bytes > self._max_bytes):
+            _, entry = entries.popitem(last=False)
+            self._total_bytes -= _entry_size(entry)
+            self._dirty = True
+
+    def get(self, key: str) -> CachedResponse | None:
+        entries = self._load()
+        entry = entries.get(key)
+        if not isinstance(entry, dict) or "body" not in entry:
+            return None
+        # Entries written before expiry was tracked count as expired
+        if entry.get("expires_at", 0.0) < time.time():
+            self._discard(key)
+            return None
+        entries.move_to_end(key)
+        return CachedResponse(
+            body=entry["body"],
+            content_type=entry.get("content_type"),
+            etag=entry.get("etag"),
+            last_modified=entry.get("last_modified"),
+        )
+
+    def set(self, key: str, cached: CachedResponse) -> None:
+        """Store or refresh ``key``; a revalidated entry gets a new lease too."""
+        entries = self._load()
+        if key in entries:
+            self._discard(key)
+        size = _body_size(cached.body)
+        if size > self._max_body_bytes:
+            return
+        entries[key] = {
+            "body": cached.body,
+            "content_type": cached.content_type,
+            "etag": cached.etag,
+            "last_modified": cached.last_modified,
+            "expires_at": time.time() + self._ttl,
+        }
+        self._total_bytes += size
+        self._dirty = True
+        self._evict()
+
+    def flush(self) -> None:
+        """Write pending changes to disk, blocking the caller."""
+        payload = self._snapshot()
+        if payload is not None:
+            self._write(payload)
+
+    async def aflush(self) -> None:
+        """Write pending changes to disk from a worker thread."""
+        # Serialize on the loop so the worker never sees the dict mid-update
+        payload = self._snapshot()
+        if payload is not None:
+            await asyncio.to_thread(self._write, payload)
+
+    def _snapshot(self) -> str | None:
+        if not self._dirty or self._entries is None:
+            return None
+        self._dirty = False
+        return json.dumps(self._entries)
+
+    def _write(self, payload: str) -> None:
+        tmp_name: str | None = None
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w",
+                encoding="utf-8",
+                dir=self._path.parent,
+                prefix=f"{self._path.name}.",
+                suffix=".tmp",
+                delete=False,
+            ) as handle:
+                tmp_name = handle.name
+                handle.write(payload)
+            os.replace(tmp_name, self._path)
+        except OSError:
+            # Caching is best-effort; a read-only home must not fail requests
+            if tmp_name is not None:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp_name)
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+
+def _body_size(body: str) -> int:
+    # Bodies hold undecodable bytes as surrogates, see GitHubClient
+    return len(body.encode("utf-8", "surrogateescape"))
+
+
+def _entry_size(entry: Any) -> int:
+    if not isinstance(entry, dict) or not isinstance(entry.get("body"), str):
+        return 0
+    return _body_size(entry["body"])
@@ -2,10 +2,48 @@
 
 from __future__ import annotations
 
+import asyncio
+import importlib.util
+from collections import deque
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
 from typing import Any
 
 import httpx
+import orjson
+
+from .cache import CachedResponse, ETagCache
+from .ratelimit import RateLimiter
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Keep-alive pool shared by every request issued through one client instance.
+# 64 keep-alive connections matches GitHub's guidance for concurrent API usage.
+DEFAULT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=64)
+
+# HTTP/2 multiplexes concurrent API calls over one connection but needs the
+# optional ``h2`` package (``httpx[http2]``)
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def _link_page(response: httpx.Response, rel: str) -> int | None:
+    """Page number of a ``Link`` header relation, or None when it is absent."""
+
+    link = response.links.get(rel)
+    if not link or "url" not in link:
+        return None
+    page = httpx.URL(link["url"]).params.get("page")
+    return int(page) if page and page.isdigit() else None
+
+
+# Cached bodies are stored as text; surrogateescape round-trips any non-UTF-8
+# bytes in a streamed diff instead of corrupting them
+def _decode_body(body: bytes) -> str:
+    return body.decode("utf-8", "surrogateescape")
+
+
+def _encode_body(body: str) -> bytes:
+    return body.encode("utf-8", "surrogateescape")
 
 
 class GitHubClientError(Exception):
@@ -22,20 +60,37 @@ class GitHubClientConfig:
 
     token: str | None
     base_url: str = "https://api.github.com"
-    timeout: float = 15.0
+    timeout: float | None = 15.0
     user_agent: str = "Lyzer-PR-Review-Agent/0.1.0"
 
 
+@dataclass(slots=True)
+class PullRequestBundle:
+    """Everything a review needs about one pull request, fetched together."""
+
+    metadata: dict[str, Any]
+    files: list[dict[str, Any]]
+    diff: str
+
+
 class GitHubClient:
-    """Thin wrapper around httpx.AsyncClient for GitHub REST operations."""
+    """Thin wrapper around httpx.AsyncClient for GitHub REST operations.
+
+    Auth and user-agent headers are sent per request, so one ``http_client``
+    (and its warm connection pool) can back many short-lived GitHubClients.
+    """
 
     def __init__(
         self,
         token: str | None,
         base_url: str,
-        timeout: float,
+        timeout: float | None,
         user_agent: str = "Lyzer-PR-Review-Agent/0.1.0",
         transport: httpx.AsyncBaseTransport | None = None,
+        limits: httpx.Limits = DEFAULT_LIMITS,
+        etag_cache: ETagCache | None = None,
+        rate_limiter: RateLimiter | None = None,
+        http_client: httpx.AsyncClient | None = None,
     ) -> None:
         self._config = GitHubClientConfig(
             token=token,
@@ -51,11 +106,38 @@ class GitHubClient:
         if token:
             self._default_headers["Authorization"] = f"Bearer {token}"
 
-        self._client = httpx.AsyncClient(
+        self._etag_cache = etag_cache
+        self._rate_limiter = rate_limiter or RateLimiter()
+
+        # A shared client belongs to whoever created it; aclose leaves it open
+        self._owns_client = http_client is None
+        self._client = http_client or httpx.AsyncClient(
             base_url=self._config.base_url,
             timeout=self._config.timeout,
             headers=self._default_headers.copy(),
             transport=transport,
+            limits=limits,
+        )
+
+    @classmethod
+    def from_shared(
+        cls,
+        http_client: httpx.AsyncClient,
+        *,
+        token: str | None,
+        user_agent: str = "Lyzer-PR-Review-Agent/0.1.0",
+        etag_cache: ETagCache | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ) -> GitHubClient:
+        """Wrap a long-lived ``http_client`` instead of opening a new pool."""
+        return cls(
+            token=token,
+            base_url=str(http_client.base_url),
+            timeout=http_client.timeout.read,
+            user_agent=user_agent,
+            etag_cache=etag_cache,
+            rate_limiter=rate_limiter,
+            http_client=http_client,
         )
 
     async def __aenter__(self) -> GitHubClient:
@@ -65,7 +147,14 @@ class GitHubClient:
         await self.aclose()
 
     async def aclose(self) -> None:
-        await self._client.aclose()
+        if self._etag_cache is not None:
+            await self._etag_cache.aflush()
+        if self._owns_client:
+            await self._client.aclose()
+
+    @property
+    def is_closed(self) -> bool:
+        return self._client.is_closed
 
     def _merge_headers(self, overrides: dict[str, str] | None = None) -> dict[str, str]:
         headers = dict(self._default_headers)
@@ -73,6 +162,196 @@ class GitHubClient:
             headers.update(overrides)
         return headers
 
+    async def _get(
+        self,
+        url: str,
+        *,
+        accept: str | None = None,
+        params: dict[str, str] | None = None,
+    ) -> httpx.Response:
+        """Issue a GET, revalidating against the ETag cache when one is configured.
+
+        Requests are paced by the client's ``RateLimiter`` and retried when GitHub
+        throttles them or fails transiently. A 304 answer is replayed from the
+        cache as a regular 200 response so callers never need to know whether the
+        body came from the network.
+        """
+
+        headers = self._merge_headers({"Accept": accept} if accept else None)
+        request = self._client.build_request("GET", url, headers=headers, params=params)
+        cache_key, cached = self._revalidate(request)
+
+        limiter = self._rate_limiter
+        for attempt in range(limiter.max_retries + 1):
+            await limiter.acquire()
+            try:
+                response = await self._client.send(request)
+            except httpx.RequestError as exc:  # pragma: no cover - network layer failure
+                raise GitHubClientError(f"GitHub API request failed: {exc}") from exc
+
+            limiter.update(response)
+            delay = limiter.retry_delay(response, attempt)
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+
+        if self._etag_cache is not None and cached is not None and response.status_code == 304:
+            # Still current on GitHub's side, so renew its expiry and recency
+            self._etag_cache.set(cache_key, cached)
+            replay_headers = {"Content-Type": cached.content_type} if cached.content_type else {}
+            return httpx.Response(
+                status_code=200,
+                content=_encode_body(cached.body),
+                headers=replay_headers,
+                request=request,
+            )
+
+        self._handle_response(response)
+        self._store(cache_key, response, response.text)
+        return response
+
+    def _revalidate(self, request: httpx.Request) -> tuple[str, CachedResponse | None]:
+        """Attach the cached validators for ``request``, returning its cache key and entry."""
+
+        cache_key = f"{request.headers['Accept']} {request.url}"
+        cached = self._etag_cache.get(cache_key) if self._etag_cache is not None else None
+        if cached is not None:
+            if cached.etag:
+                request.headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                request.headers["If-Modified-Since"] = cached.last_modified
+        return cache_key, cached
+
+    def _wants_body(self, response: httpx.Response) -> bool:
+        return self._etag_cache is not None and (
+            "ETag" in response.headers or "Last-Modified" in response.headers
+        )
+
+    def _store(self, cache_key: str, response: httpx.Response, body: str) -> None:
+        if self._etag_cache is not None and self._wants_body(response):
+            self._etag_cache.set(
+                cache_key,
+                CachedResponse(
+                    body=body,
+                    content_type=response.headers.get("Content-Type"),
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                ),
+            )
+
+    async def _stream(self, url: str, *, accept: str) -> AsyncIterator[bytes]:
+        """Yield a response body in fixed-size chunks without buffering it whole.
+
+        Revalidates against the ETag cache like ``_get``: a 304 replays the stored
+        body in the same chunk size. With a cache configured, a 200 that carries
+        validators is also collected while it streams so the next call can send
+        ``If-None-Match``, unless it outgrows the cache's ``max_body_bytes``.
+        """
+
+        headers = self._merge_headers({"Accept": accept})
+        request = self._client.build_request("GET", url, headers=headers)
+        cache_key, cached = self._revalidate(request)
+
+        limiter = self._rate_limiter
+        try:
+            for attempt in range(limiter.max_retries + 1):
+                await limiter.acquire()
+                response = await self._client.send(request, stream=True)
+                try:
+                    limiter.update(response)
+                    if self._etag_cache is not None and cached is not None:
+                        if response.status_code == 304:
+                            self._etag_cache.set(cache_key, cached)
+                            body = _encode_body(cached.body)
+                            for start in range(0, len(body), STREAM_CHUNK_SIZE):
+                                yield body[start : start + STREAM_CHUNK_SIZE]
+                            return
+
+                    if not response.is_error:
+                        parts: list[bytes] | None = [] if self._wants_body(response) else None
+                        size = 0
+                        async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE):
+                            if parts is not None and self._etag_cache is not None:
+                                size += len(chunk)
+                                # Too big to cache: give the memory back and stream the rest
+                                if size > self._etag_cache.max_body_bytes:
+                                    parts = None
+                                else:
+                                    parts.append(chunk)
+                            yield chunk
+                        if parts is not None:
+                            self._store(cache_key, response, _decode_body(b"".join(parts)))
+                        return
+
+                    delay = limiter.retry_delay(response, attempt)
+                    if delay is None:
+                        await response.aread()
+                        self._handle_response(response)
+                        return
+                finally:
+                    await response.aclose()
+                # Only retried before the first byte is yielded, so nothing is replayed
+                await asyncio.sleep(delay)
+        except httpx.RequestError as exc:  # pragma: no cover - network layer failure
+            raise GitHubClientError(f"GitHub API request failed: {exc}") from exc
+
+    async def _iter_pages(
+        self, url: str, *, per_page: int, prefetch: int, params: dict[str, str] | None = None
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield every item of a paginated list endpoint, prefetching ahead.
+
+        The first page's ``Link: rel="last"`` header tells how many pages exist,
+        so up to ``prefetch`` further pages are requested while the caller
+        consumes the current one. Without it, ``rel="next"`` is followed one
+        page at a time.
+        """
+
+        def page_params(page: int) -> dict[str, str]:
+            return {**(params or {}), "per_page": str(per_page), "page": str(page)}
+
+        response = await self._get(url, params=page_params(1))
+        for item in self._expect_list(response):
+            yield item
+
+        last_page = _link_page(response, "last")
+        if last_page is None:
+            page = 1
+            while _link_page(response, "next") is not None:
+                page += 1
+                response = await self._get(url, params=page_params(page))
+                for item in self._expect_list(response):
+                    yield item
+            return
+
+        pending: deque[asyncio.Task[httpx.Response]] = deque()
+        next_page = 2
+        try:
+            while pending or next_page <= last_page:
+                while next_page <= last_page and len(pending) < max(1, prefetch):
+                    pending.append(
+                        asyncio.create_task(self._get(url, params=page_params(next_page)))
+                    )
+                    next_page += 1
+                for item in self._expect_list(await pending.popleft()):
+                    yield item
+        finally:
+            for task in pending:
+                task.cancel()
+
+    @staticmethod
+    def _expect_list(response: httpx.Response) -> list[dict[str, Any]]:
+        data = orjson.loads(response.content)
+        if not isinstance(data, list):
+            raise GitHubClientError("Unexpected response type from GitHub (expected list)")
+        return data
+
+    @staticmethod
+    def _expect_object(response: httpx.Response) -> dict[str, Any]:
+        data = orjson.loads(response.content)
+        if not isinstance(data, dict):
+            raise GitHubClientError("Unexpected response type from GitHub (expected object)")
+        return data
+
     def _handle_response(self, response: httpx.Response) -> None:
         try:
             response.raise_for_status()
@@ -83,7 +362,7 @@ class GitHubClient:
     @staticmethod
     def _extract_error_message(response: httpx.Response) -> str:
         try:
-            payload = response.json()
+            payload = orjson.loads(response.content)
         except ValueError:
             return f"GitHub API request failed with status {response.status_code}"
 
@@ -96,13 +375,8 @@ class GitHubClient:
         """Fetch pull request metadata."""
 
         url = f"/repos/{owner}/{repo}/pulls/{number}"
-        try:
-            response = await self._client.get(url, headers=self._merge_headers())
-        except httpx.RequestError as exc:  # pragma: no cover - network layer failure
-            raise GitHubClientError(f"GitHub API request failed: {exc}") from exc
-
-        self._handle_response(response)
-        return response.json()
+        response = await self._get(url)
+        return self._expect_object(response)
 
     async def list_pull_requests(
         self,
@@ -122,20 +396,8 @@ class GitHubClient:
             "page": str(page),
         }
 
-        try:
-            response = await self._client.get(
-                url,
-                headers=self._merge_headers(),
-                params=params,
-            )
-        except httpx.RequestError as exc:  # pragma: no cover - network layer failure
-            raise GitHubClientError(f"GitHub API request failed: {exc}") from exc
-
-        self._handle_response(response)
-        data = response.json()
-        if not isinstance(data, list):
-            raise GitHubClientError("Unexpected response type from GitHub (expected list)")
-        return data
+        response = await self._get(url, params=params)
+        return self._expect_list(response)
 
     async def get_pull_request_files(
         self,
@@ -154,20 +416,8 @@ class GitHubClient:
             "page": str(page),
         }
 
-        try:
-            response = await self._client.get(
-                url,
-                headers=self._merge_headers(),
-                params=params,
-            )
-        except httpx.RequestError as exc:  # pragma: no cover - network layer failure
-            raise GitHubClientError(f"GitHub API request failed: {exc}") from exc
-
-        self._handle_response(response)
-        data = response.json()
-        if not isinstance(data, list):
-            raise GitHubClientError("Unexpected response type from GitHub (expected list)")
-        return data
+        response = await self._get(url, params=params)
+        return self._expect_list(response)
 
     async def get_pull_request_commits(
         self,
@@ -186,45 +436,84 @@ class GitHubClient:
             "page": str(page),
         }
 
-        try:
-            response = await self._client.get(
-                url,
-                headers=self._merge_headers(),
-                params=params,
-            )
-        except httpx.RequestError as exc:  # pragma: no cover - network layer failure
-            raise GitHubClientError(f"GitHub API request failed: {exc}") from exc
+        response = await self._get(url, params=params)
+        return self._expect_list(response)
 
-        self._handle_response(response)
-        data = response.json()
-        if not isinstance(data, list):
-            raise GitHubClientError("Unexpected response type from GitHub (expected list)")
-        return data
+    def iter_pull_requests(
+        self,
+        owner: str,
+        repo: str,
+        *,
+        state: str = "open",
+        per_page: int = 100,
+        prefetch: int = 2,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Iterate over every pull request of a repository across all pages."""
+
+        url = f"/repos/{owner}/{repo}/pulls"
+        return self._iter_pages(url, per_page=per_page, prefetch=prefetch, params={"state": state})
+
+    def iter_pull_request_files(
+        self, owner: str, repo: str, number: int, *, per_page: int = 100, prefetch: int = 2
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Iterate over every changed file of a pull request across all pages."""
+
+        url = f"/repos/{owner}/{repo}/pulls/{number}/files"
+        return self._iter_pages(url, per_page=per_page, prefetch=prefetch)
+
+    def iter_pull_request_commits(
+        self, owner: str, repo: str, number: int, *, per_page: int = 100, prefetch: int = 2
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Iterate over every commit of a pull request across all pages."""
+
+        url = f"/repos/{owner}/{repo}/pulls/{number}/commits"
+        return self._iter_pages(url, per_page=per_page, prefetch=prefetch)
 
     async def get_pull_request_diff(self, owner: str, repo: str, number: int) -> str:
         """Fetch the unified diff for a pull request."""
 
         url = f"/repos/{owner}/{repo}/pulls/{number}"
-        headers = self._merge_headers({"Accept": "application/vnd.github.v3.diff"})
+        response = await self._get(url, accept="application/vnd.github.v3.diff")
+        return response.text
 
-        try:
-            response = await self._client.get(url, headers=headers)
-        except httpx.RequestError as exc:  # pragma: no cover - network layer failure
-            raise GitHubClientError(f"GitHub API request failed: {exc}") from exc
+    async def fetch_pr_bundle(self, owner: str, repo: str, number: int) -> PullRequestBundle:
+        """Fetch PR metadata, every changed file and the diff concurrently.
 
-        self._handle_response(response)
-        return response.text
+        The three requests overlap (and share one connection under HTTP/2), so
+        the wait is the slowest call rather than their sum.
+        """
+
+        async def all_files() -> list[dict[str, Any]]:
+            return [file async for file in self.iter_pull_request_files(owner, repo, number)]
+
+        metadata, files, diff = await asyncio.gather(
+            self.get_pull_request(owner, repo, number),
+            all_files(),
+            self.get_pull_request_diff(owner, repo, number),
+        )
+        return PullRequestBundle(metadata=metadata, files=files, diff=diff)
 
     async def get_pull_request_patch(self, owner: str, repo: str, number: int) -> str:
         """Fetch the patch format for a pull request."""
 
         url = f"/repos/{owner}/{repo}/pulls/{number}"
-        headers = self._merge_headers({"Accept": "application/vnd.github.v3.patch"})
+        response = await self._get(url, accept="application/vnd.github.v3.patch")
+        return response.text
 
-        try:
-            response = await self._client.get(url, headers=headers)
-        except httpx.RequestError as exc:  # pragma: no cover - network layer failure
-            raise GitHubClientError(f"GitHub API request failed: {exc}") from exc
+    async def stream_pull_request_diff(
+        self, owner: str, repo: str, number: int
+    ) -> AsyncIterator[bytes]:
+        """Stream the unified diff for a pull request as raw byte chunks."""
 
-        self._handle_response(response)
-        return response.text
+        url = f"/repos/{owner}/{repo}/pulls/{number}"
+        async for chunk in self._stream(url, accept="application/vnd.github.v3.diff"):
+            yield chunk
+
+    async def stream_pull_request_patch(
+        self, owner: str, repo: str, number: int
+    ) -> AsyncIterator[bytes]:
+        """Stream the patch format for a pull request as raw byte chunks."""
+
+        url = f"/repos/{owner}/{repo}/pulls/{number}"
+        async for chunk in self._stream(url, accept="application/vnd.github.v3.patch"):
+            yield chunk
@@ -0,0 +1,104 @@
+"""Header-driven pacing and retry policy for GitHub API requests."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import httpx
+
+# Transient server-side failures that are worth retrying with backoff
+_RETRYABLE_SERVER_STATUS = frozenset({500, 502, 503, 504})
+
+
+def _parse_float(value: str | None) -> float | None:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+class RateLimiter:
+    """Paces requests from GitHub's ``X-RateLimit-*`` headers and plans retries.
+
+    While plenty of budget is left requests go out unthrottled. Once
+    ``X-RateLimit-Remaining`` drops to ``low_watermark`` the remaining budget is
+    spread evenly until ``X-RateLimit-Reset``, so long batch runs slow down
+    instead of exhausting the quota and stalling on 403s.
+    """
+
+    def __init__(
+        self,
+        *,
+        low_watermark: int = 100,
+        max_retries: int = 3,
+        max_backoff: float = 60.0,
+    ) -> None:
+        self.max_retries = max_retries
+        self._low_watermark = low_watermark
+        self._max_backoff = max_backoff
+        self._remaining: int | None = None
+        self._reset_at: float | None = None
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until the next request may be sent."""
+        async with self._lock:
+            now = time.time()
+            delay = self._next_slot - now
+            if delay > 0:
+                await asyncio.sleep(delay)
+                now += delay
+            self._next_slot = now + self._interval(now)
+
+    def _interval(self, now: float) -> float:
+        if self._remaining is None or self._reset_at is None:
+            return 0.0
+        if self._remaining > self._low_watermark:
+            return 0.0
+        window = max(self._reset_at - now, 0.0)
+        return min(window / max(1, self._remaining), self._max_backoff)
+
+    def update(self, response: httpx.Response) -> None:
+        """Record the rate-limit budget reported by a response."""
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        if remaining is not None and remaining.isdigit():
+            self._remaining = int(remaining)
+        reset = _parse_float(response.headers.get("X-RateLimit-Reset"))
+        if reset is not None:
+            self._reset_at = reset
+
+    def retry_delay(self, response: httpx.Response, attempt: int) -> float | None:
+        """Return seconds to wait before retrying ``response``, or None to give up.
+
+        Rate-limited answers (429, or 403 carrying ``Retry-After`` or an exhausted
+        budget) wait exactly as long as GitHub asks; transient 5xx answers back
+        off exponentially. Waits longer than ``max_backoff`` are not attempted.
+        """
+        if attempt >= self.max_retries:
+            return None
+
+        status = response.status_code
+        headers = response.headers
+        if status in (403, 429):
+            retry_after = _parse_float(headers.get("Retry-After"))
+            reset = _parse_float(headers.get("X-RateLimit-Reset"))
+            if retry_after is not None:
+                delay = retry_after
+            elif headers.get("X-RateLimit-Remaining") == "0" and reset is not None:
+                delay = reset - time.time()
+            elif status == 429:
+                delay = 2.0**attempt
+            else:
+                # A plain 403 is a permissions problem, not throttling
+                return None
+        elif status in _RETRYABLE_SERVER_STATUS:
+            delay = 2.0**attempt
+        else:
+            return None
+
+        delay = max(delay, 0.0)
+        return delay if delay <= self._max_backoff else None
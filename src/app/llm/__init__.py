@@ -1,5 +1,6 @@
 """LLM integration module."""
 
-from .client import FakeLLMClient, LLMClient, LLMConfig
+from .cache import ResponseCache
+from .client import FakeLLMClient, LLMClient, LLMConfig, SupportsGenerate
 
-__all__ = ["LLMClient", "LLMConfig", "FakeLLMClient"]
+__all__ = ["LLMClient", "LLMConfig", "FakeLLMClient", "ResponseCache", "SupportsGenerate"]
@@ -0,0 +1,59 @@
+"""In-memory, content-addressed cache of LLM completions."""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from collections import OrderedDict
+
+from prometheus_client import Counter
+
+# Seven days: long enough to cover CI re-runs and re-requested reviews
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600.0
+
+_HITS = Counter("llm_cache_hits", "LLM completions served from the response cache")
+_MISSES = Counter("llm_cache_misses", "LLM requests that missed the response cache")
+
+
+class ResponseCache:
+    """Bounded LRU mapping a generation request to the text the model returned.
+
+    Keys hash the model, sampling options and the full prompt, so agents (whose
+    prompts embed their own instructions) never collide with one another. Re-runs
+    over unchanged code are answered without an LLM round-trip.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = DEFAULT_TTL_SECONDS) -> None:
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._entries: OrderedDict[bytes, tuple[float, str]] = OrderedDict()
+
+    @staticmethod
+    def key(model: str, prompt: str, temperature: float | None, max_tokens: int | None) -> bytes:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{model}\0{temperature}\0{max_tokens}\0".encode())
+        digest.update(prompt.encode())
+        return digest.digest()
+
+    def get(self, key: bytes) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            _MISSES.inc()
+            return None
+        expires_at, response = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            _MISSES.inc()
+            return None
+        self._entries.move_to_end(key)
+        _HITS.inc()
+        return response
+
+    def set(self, key: bytes, response: str) -> None:
+        self._entries[key] = (time.monotonic() + self._ttl, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
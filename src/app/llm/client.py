@@ -1,10 +1,24 @@
 """LLM client for Ollama integration."""
 
-from typing import Any
+import asyncio
+import importlib.util
+from collections.abc import AsyncIterator
+from typing import Any, Protocol
 
 import httpx
+import orjson
 from pydantic import BaseModel, Field
 
+from .cache import ResponseCache
+
+
+class SupportsGenerate(Protocol):
+    """What agents and the orchestrator need from an LLM client."""
+
+    async def generate(
+        self, prompt: str, temperature: float | None = None, max_tokens: int | None = None
+    ) -> str: ...
+
 
 class LLMConfig(BaseModel):
     """Configuration for LLM client."""
@@ -12,19 +26,52 @@ class LLMConfig(BaseModel):
     base_url: str = Field(default="http://ollama:11434", description="Ollama base URL")
     model: str = Field(default="qwen2.5-coder:3b", description="Model name")
     timeout: float = Field(default=60.0, description="Request timeout in seconds")
+    max_retries: int = Field(default=3, description="Retries for rate-limited/overloaded replies")
+    max_backoff: float = Field(default=30.0, description="Upper bound for a single retry delay")
+    max_connections: int = Field(default=100, description="Connection pool size")
+    keepalive_expiry: float = Field(default=60.0, description="Seconds an idle connection is kept")
+    keep_alive: str | None = Field(
+        default="30m", description="How long Ollama keeps the model loaded after a request"
+    )
+
+
+# Ollama answers 503 when its request queue is full; hosted providers use 429
+_RETRYABLE_STATUS = frozenset({429, 503})
+
+# HTTP/2 is negotiated over TLS only, so it applies to HTTPS backends rather than a
+# plain-HTTP Ollama; it needs the optional ``h2`` package (``httpx[http2]``)
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
 
 
 class LLMClient:
     """Client for interacting with Ollama LLM."""
 
-    def __init__(self, config: LLMConfig) -> None:
+    def __init__(
+        self,
+        config: LLMConfig,
+        cache: ResponseCache | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
         """Initialize LLM client.
 
         Args:
             config: LLM configuration
+            cache: Optional cache of completions for previously seen prompts
+            transport: Optional httpx transport (e.g. ``httpx.MockTransport`` in tests)
         """
         self._config = config
-        self._client = httpx.AsyncClient(base_url=config.base_url, timeout=config.timeout)
+        self._cache = cache
+        self._client = httpx.AsyncClient(
+            base_url=config.base_url,
+            timeout=config.timeout,
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_connections,
+                keepalive_expiry=config.keepalive_expiry,
+            ),
+            http2=_HTTP2_AVAILABLE,
+            transport=transport,
+        )
 
     async def generate(
         self, prompt: str, temperature: float | None = None, max_tokens: int | None = None
@@ -42,11 +89,72 @@ class LLMClient:
         Raises:
             httpx.HTTPError: If the request fails
         """
+        cache_key = None
+        if self._cache is not None:
+            cache_key = self._cache.key(self._config.model, prompt, temperature, max_tokens)
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        payload = self._payload(prompt, temperature, max_tokens, stream=False)
+        for attempt in range(self._config.max_retries + 1):
+            response = await self._client.post("/api/generate", json=payload)
+            if response.status_code not in _RETRYABLE_STATUS or attempt == self._config.max_retries:
+                break
+            await asyncio.sleep(self._retry_delay(response, attempt))
+
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        text = data.get("response", "")
+        if cache_key is not None:
+            self._cache.set(cache_key, text)  # type: ignore[union-attr]
+        return text
+
+    async def generate_stream(
+        self, prompt: str, temperature: float | None = None, max_tokens: int | None = None
+    ) -> AsyncIterator[str]:
+        """Yield response fragments as the model produces them.
+
+        Agents parse whole JSON replies, so they use ``generate``. This is for
+        callers that can act on partial output. The read timeout applies
+        between fragments rather than to the whole generation. Results are not
+        cached.
+
+        Raises:
+            httpx.HTTPError: If the request fails
+            RuntimeError: If Ollama reports an error mid-stream
+        """
+        payload = self._payload(prompt, temperature, max_tokens, stream=True)
+        for attempt in range(self._config.max_retries + 1):
+            async with self._client.stream("POST", "/api/generate", json=payload) as response:
+                if (
+                    response.status_code not in _RETRYABLE_STATUS
+                    or attempt == self._config.max_retries
+                ):
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        if not line:
+                            continue
+                        data = orjson.loads(line)
+                        if "error" in data:
+                            raise RuntimeError(f"LLM stream failed: {data['error']}")
+                        if fragment := data.get("response"):
+                            yield fragment
+                    return
+                delay = self._retry_delay(response, attempt)
+            await asyncio.sleep(delay)
+
+    def _payload(
+        self, prompt: str, temperature: float | None, max_tokens: int | None, *, stream: bool
+    ) -> dict[str, Any]:
         payload: dict[str, Any] = {
             "model": self._config.model,
             "prompt": prompt,
-            "stream": False,
+            "stream": stream,
         }
+        if self._config.keep_alive is not None:
+            # Ollama unloads idle models after 5 minutes by default; reloading costs seconds
+            payload["keep_alive"] = self._config.keep_alive
 
         # Add optional parameters
         if temperature is not None or max_tokens is not None:
@@ -55,11 +163,16 @@ class LLMClient:
                 payload["options"]["temperature"] = temperature
             if max_tokens is not None:
                 payload["options"]["num_predict"] = max_tokens
-
-        response = await self._client.post("/api/generate", json=payload)
-        response.raise_for_status()
-        data = response.json()
-        return data.get("response", "")
+        return payload
+
+    def _retry_delay(self, response: httpx.Response, attempt: int) -> float:
+        """Honour ``Retry-After`` when present, otherwise back off exponentially."""
+        retry_after = response.headers.get("Retry-After")
+        try:
+            delay = float(retry_after) if retry_after is not None else 2.0**attempt
+        except ValueError:
+            delay = 2.0**attempt
+        return min(max(delay, 0.0), self._config.max_backoff)
 
     async def close(self) -> None:
         """Close the HTTP client."""
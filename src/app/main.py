@@ -3,12 +3,25 @@
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import CONTENT_TYPE_LATEST
 from prometheus_fastapi_instrumentator import Instrumentator
 
 from src.app.api.review import router as review_router
 from src.app.core import get_logger, get_settings, setup_logging
+from src.app.core.dependencies import (
+    close_github_caches,
+    close_llm_client,
+    create_github_http_client,
+    get_review_jobs,
+)
+from src.app.core.metrics import MetricsCache
+
+logger = get_logger(__name__)
+# Settings are frozen and cached for the process, so one module-level binding serves
+# every handler instead of a lookup per request
+settings = get_settings()
 
 
 @asynccontextmanager
@@ -16,15 +29,20 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan events."""
     # Startup
     logger = setup_logging()
-    settings = get_settings()
     logger.info(
         "application_starting",
         app_name=settings.app_name,
         version=settings.app_version,
         debug=settings.debug,
     )
+    # One keep-alive pool for every GitHub call instead of a handshake per request
+    app.state.github_http = create_github_http_client()
     yield
-    # Shutdown
+    # Shutdown: stop queued reviews before the clients they use are closed
+    await get_review_jobs().aclose()
+    await app.state.github_http.aclose()
+    await close_github_caches()
+    await close_llm_client()
     logger.info("application_shutdown")
 
 
@@ -46,15 +64,27 @@ app.add_middleware(
 )
 
 # Prometheus metrics
-settings = get_settings()
 if settings.enable_metrics:
-    Instrumentator().instrument(app).expose(app, endpoint="/metrics")
+    # instrument() adds middleware, which Starlette refuses once the app is running,
+    # so this stays at import time rather than in lifespan. Probes and scrapes are
+    # left out so they do not add label series to every scrape.
+    instrumentator = Instrumentator(
+        should_group_status_codes=True,
+        excluded_handlers=["/health", "/metrics"],
+    ).instrument(app)
+    metrics_cache = MetricsCache(instrumentator.registry, ttl=settings.metrics_cache_ttl)
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics() -> Response:
+        """Prometheus metrics, re-rendered at most once per ``metrics_cache_ttl``."""
+        return Response(metrics_cache.render(), media_type=CONTENT_TYPE_LATEST)
+
 
 app.include_router(review_router)
 
 
 @app.get("/")
-async def root():
+async def root() -> dict[str, str]:
     """Root endpoint."""
     return {
         "message": "Lyzer PR Review Agent API",
@@ -64,9 +94,8 @@ async def root():
 
 
 @app.get("/health")
-async def health():
+async def health() -> dict[str, str]:
     """Health check endpoint."""
-    logger = get_logger(__name__)
     logger.debug("health_check_requested")
     return {
         "status": "healthy",
@@ -75,9 +104,8 @@ async def health():
 
 
 @app.get("/version")
-async def version():
+async def version() -> dict[str, str | bool]:
     """Version information."""
-    settings = get_settings()
     return {
         "app_name": settings.app_name,
         "version": settings.app_version,
@@ -1,10 +1,11 @@
 """Pydantic models for the PR review system."""
 
-from .base import Language, ReviewCategory, Severity
+from .base import JobStatus, Language, ReviewCategory, Severity
 from .code import CodeChunk, FileDiff
-from .review import ReviewComment, ReviewRequest, ReviewResponse
+from .review import ReviewComment, ReviewJob, ReviewRequest, ReviewResponse
 
 __all__ = [
+    "JobStatus",
     "Language",
     "ReviewCategory",
     "Severity",
@@ -13,4 +14,5 @@ __all__ = [
     "ReviewComment",
     "ReviewRequest",
     "ReviewResponse",
+    "ReviewJob",
 ]
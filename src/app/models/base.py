@@ -1,9 +1,9 @@
 """Base models and enums for the PR review system."""
 
-from enum import Enum
+from enum import StrEnum
 
 
-class Severity(str, Enum):
+class Severity(StrEnum):
     """Severity levels for review comments."""
 
     CRITICAL = "critical"
@@ -11,7 +11,7 @@ class Severity(str, Enum):
     INFO = "info"
 
 
-class ReviewCategory(str, Enum):
+class ReviewCategory(StrEnum):
     """Categories of code review feedback."""
 
     LOGIC = "logic"
@@ -22,7 +22,16 @@ class ReviewCategory(str, Enum):
     BEST_PRACTICES = "best_practices"
 
 
-class Language(str, Enum):
+class JobStatus(StrEnum):
+    """Lifecycle of a queued review job."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class Language(StrEnum):
     """Supported programming languages."""
 
     PYTHON = "python"
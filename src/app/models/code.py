@@ -1,6 +1,8 @@
 """Code-related models for diff parsing and code chunks."""
 
-from pydantic import BaseModel, Field
+from functools import cached_property
+
+from pydantic import BaseModel, ConfigDict, Field
 
 from .base import Language
 
@@ -8,13 +10,27 @@ from .base import Language
 class CodeChunk(BaseModel):
     """A section of code that changed in a PR."""
 
+    model_config = ConfigDict(frozen=True)
+
     file_path: str = Field(..., description="Path to the file")
     language: Language = Field(default=Language.UNKNOWN, description="Programming language")
     original_lines: list[str] = Field(default_factory=list, description="Original code lines")
     new_lines: list[str] = Field(default_factory=list, description="New code lines")
+    changed_line_indices: list[int] = Field(
+        default_factory=list, description="Indexes into new_lines of added lines"
+    )
     start_line: int = Field(..., description="Starting line number")
     end_line: int | None = Field(None, description="Ending line number")
 
+    @cached_property
+    def code_text(self) -> str:
+        """New lines joined into one string, computed once per chunk.
+
+        Chunks are frozen, so ``new_lines`` cannot be reassigned under this cache;
+        build a new chunk rather than editing the list in place.
+        """
+        return "\n".join(self.new_lines)
+
     @property
     def line_count(self) -> int:
         """Number of new lines in this chunk."""
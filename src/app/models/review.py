@@ -1,13 +1,29 @@
 """Review-related models for comments and responses."""
 
-from pydantic import BaseModel, Field, field_validator, model_validator
+from collections import Counter
+from collections.abc import Mapping
+from functools import cached_property
+from typing import Any, Self
 
-from .base import ReviewCategory, Severity
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    PrivateAttr,
+    computed_field,
+    field_validator,
+    model_validator,
+)
+
+from .base import JobStatus, ReviewCategory, Severity
 
 
 class ReviewComment(BaseModel):
     """A single code review comment from an agent."""
 
+    # Frozen so the hash used for deduplication cannot change under a set
+    model_config = ConfigDict(frozen=True)
+
     file_path: str = Field(..., description="Path to the file")
     line_number: int = Field(..., description="Line number in the file")
     severity: Severity = Field(default=Severity.WARNING, description="Severity level")
@@ -16,9 +32,21 @@ class ReviewComment(BaseModel):
     suggestion: str | None = Field(None, description="Suggested fix or improvement")
     agent_name: str | None = Field(None, description="Name of the agent that generated this")
 
+    # Fields are frozen, so the dedup hash is computed once per instance
+    _hash: int | None = PrivateAttr(default=None)
+
     def __hash__(self) -> int:
         """Make comment hashable for deduplication."""
-        return hash((self.file_path, self.line_number, self.message))
+        if self._hash is None:
+            self._hash = hash((self.file_path, self.line_number, self.message))
+        return self._hash
+
+    def model_copy(self, *, update: Mapping[str, Any] | None = None, deep: bool = False) -> Self:
+        """Copy the comment, dropping the cached hash when fields change."""
+        copied = super().model_copy(update=update, deep=deep)
+        if update:
+            copied._hash = None
+        return copied
 
     def __eq__(self, other: object) -> bool:
         """Check equality for deduplication."""
@@ -43,6 +71,7 @@ class ReviewRequest(BaseModel):
     repo: str | None = Field(
         None,
         description="Repository in format owner/repo",
+        # Anchored and requiring both sides, so it alone rejects a missing owner or name
         pattern=r"^[a-zA-Z0-9_.-]+/[a-zA-Z0-9_.-]+$",
     )
     diff: str | None = Field(
@@ -57,39 +86,25 @@ class ReviewRequest(BaseModel):
             raise ValueError("Diff cannot be empty or only whitespace")
         return v
 
-    @field_validator("repo")
-    @classmethod
-    def validate_repo_format(cls, v: str | None) -> str | None:
-        """Validate repository format."""
-        if v is not None:
-            if "/" not in v:
-                raise ValueError("Repository must be in format 'owner/repo'")
-            owner, repo = v.split("/", 1)
-            if not owner or not repo:
-                raise ValueError("Repository must have both owner and repo name")
-        return v
-
     @model_validator(mode="after")
     def validate_input_combination(self) -> "ReviewRequest":
         """Validate that either pr_id+repo or diff is provided, but not both."""
-        has_pr = self.pr_id is not None and self.repo is not None
-        has_diff = self.diff is not None
-
-        if has_pr and has_diff:
-            raise ValueError("Provide either 'pr_id' + 'repo' OR 'diff', not both")
+        has_pr_id = self.pr_id is not None
+        if has_pr_id != (self.repo is not None):
+            raise ValueError(
+                "'pr_id' requires 'repo' to be specified"
+                if has_pr_id
+                else "'repo' requires 'pr_id' to be specified"
+            )
 
-        if not has_pr and not has_diff:
+        if has_pr_id == (self.diff is not None):
             raise ValueError(
-                "Must provide either 'pr_id' + 'repo' for GitHub PR review, "
+                "Provide either 'pr_id' + 'repo' OR 'diff', not both"
+                if has_pr_id
+                else "Must provide either 'pr_id' + 'repo' for GitHub PR review, "
                 "or 'diff' for manual diff review"
             )
 
-        if self.pr_id is not None and self.repo is None:
-            raise ValueError("'pr_id' requires 'repo' to be specified")
-
-        if self.repo is not None and self.pr_id is None:
-            raise ValueError("'repo' requires 'pr_id' to be specified")
-
         return self
 
     def validate_input(self) -> bool:
@@ -102,22 +117,58 @@ class ReviewRequest(BaseModel):
 class ReviewResponse(BaseModel):
     """API response with review results."""
 
+    # Frozen so the severity tally cached below cannot drift from ``comments``
+    model_config = ConfigDict(frozen=True)
+
     pr_id: int | None = Field(None, description="GitHub PR ID")
     repo: str | None = Field(None, description="Repository name")
     comments: list[ReviewComment] = Field(default_factory=list, description="Review comments")
-    total_issues: int = Field(default=0, description="Total number of issues found")
-    critical_count: int = Field(default=0, description="Number of critical issues")
-    warning_count: int = Field(default=0, description="Number of warnings")
-    info_count: int = Field(default=0, description="Number of info items")
     ignored_files: list[str] = Field(
         default_factory=list, description="Files ignored (binary or unsupported language)"
     )
 
-    def __init__(self, **data):
-        """Initialize and calculate counts."""
-        super().__init__(**data)
-        if self.comments:
-            self.total_issues = len(self.comments)
-            self.critical_count = sum(1 for c in self.comments if c.severity == Severity.CRITICAL)
-            self.warning_count = sum(1 for c in self.comments if c.severity == Severity.WARNING)
-            self.info_count = sum(1 for c in self.comments if c.severity == Severity.INFO)
+    # Derived from ``comments`` on access and cost nothing until the response is
+    # serialized; the per-severity counts share one pass over the comments
+
+    @computed_field(description="Total number of issues found")  # type: ignore[prop-decorator]
+    @property
+    def total_issues(self) -> int:
+        return len(self.comments)
+
+    @computed_field(description="Number of critical issues")  # type: ignore[prop-decorator]
+    @property
+    def critical_count(self) -> int:
+        return self._count(Severity.CRITICAL)
+
+    @computed_field(description="Number of warnings")  # type: ignore[prop-decorator]
+    @property
+    def warning_count(self) -> int:
+        return self._count(Severity.WARNING)
+
+    @computed_field(description="Number of info items")  # type: ignore[prop-decorator]
+    @property
+    def info_count(self) -> int:
+        return self._count(Severity.INFO)
+
+    def model_copy(self, *, update: Mapping[str, Any] | None = None, deep: bool = False) -> Self:
+        """Copy the response, dropping the cached tally when comments change."""
+        copied = super().model_copy(update=update, deep=deep)
+        if update and "comments" in update:
+            copied.__dict__.pop("_severity_counts", None)
+        return copied
+
+    @cached_property
+    def _severity_counts(self) -> Counter[Severity]:
+        return Counter(c.severity for c in self.comments)
+
+    def _count(self, severity: Severity) -> int:
+        return self._severity_counts[severity]
+
+
+class ReviewJob(BaseModel):
+    """Status of a review queued with ``POST /review/pr/jobs``."""
+
+    job_id: str = Field(..., description="Identifier to poll the job with")
+    status: JobStatus = Field(default=JobStatus.PENDING, description="Current job state")
+    result: ReviewResponse | None = Field(default=None, description="Review result once completed")
+    error: str | None = Field(default=None, description="Failure reason if the job failed")
@@ -5,6 +5,13 @@ from fastapi.testclient import TestClient
 
 from src.app.core import Settings
 from src.app.main import app
+from src.app.models import CodeChunk, ReviewComment
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    """Run ``@pytest.mark.anyio`` tests on asyncio, sharing one loop for the session."""
+    return "asyncio"
 
 
 @pytest.fixture
@@ -25,9 +32,9 @@ def client():
     return TestClient(app)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_code_chunk_data():
-    """Sample code chunk data for testing."""
+    """Sample code chunk data for testing (shared; copy before modifying)."""
     return {
         "file_path": "src/main.py",
         "language": "python",
@@ -52,9 +59,9 @@ index 1234567..abcdefg 100644
 """
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_review_comment_data():
-    """Sample review comment data."""
+    """Sample review comment data (shared; copy before modifying)."""
     return {
         "file_path": "src/main.py",
         "line_number": 10,
@@ -63,3 +70,24 @@ def sample_review_comment_data():
         "message": "Function name should be more descriptive",
         "suggestion": "Consider renaming to describe what the function does",
     }
+
+
+@pytest.fixture(scope="session")
+def sample_code_chunk(sample_code_chunk_data):
+    """Validated CodeChunk built once from ``sample_code_chunk_data``."""
+    return CodeChunk(**sample_code_chunk_data)
+
+
+@pytest.fixture(scope="session")
+def sample_review_comment(sample_review_comment_data):
+    """Validated ReviewComment built once from ``sample_review_comment_data``."""
+    return ReviewComment(**sample_review_comment_data)
+
+
+@pytest.fixture(scope="session")
+def three_severity_comments(sample_review_comment_data):
+    """One validated comment per severity, on distinct lines."""
+    return [
+        ReviewComment(**{**sample_review_comment_data, "severity": severity, "line_number": line})
+        for severity, line in (("critical", 10), ("warning", 20), ("info", 30))
+    ]
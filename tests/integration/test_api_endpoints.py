@@ -37,3 +37,18 @@ class TestHealthEndpoints:
         assert response.status_code == 200
         # Metrics should be in Prometheus format
         assert "http_requests_total" in response.text or "# TYPE" in response.text
+
+    def test_metrics_exclude_health_and_metrics_handlers(self, client):
+        """Probes and scrapes do not create request series."""
+        client.get("/health")
+        response = client.get("/metrics")
+        assert 'handler="/health"' not in response.text
+        assert 'handler="/metrics"' not in response.text
+
+    def test_metrics_payload_reused_within_ttl(self, client):
+        """Scrapes inside metrics_cache_ttl get the same rendered payload."""
+        first = client.get("/metrics")
+        client.get("/health")
+        second = client.get("/metrics")
+        assert second.content == first.content
+        assert second.headers["content-type"].startswith("text/plain")
@@ -1,18 +1,26 @@
 from __future__ import annotations
 
-from collections.abc import Iterable, Iterator
-from typing import Any
+import asyncio
+import time
+from collections.abc import AsyncIterator, Iterable, Iterator
+from typing import Any, Final
 
 import pytest
 from fastapi.testclient import TestClient
 
 from src.app.core import dependencies
+from src.app.core.jobs import ReviewJobStore
+from src.app.core.settings import get_settings
+from src.app.github.client import GitHubClientError
 from src.app.main import app
+from src.app.models.base import JobStatus
 from src.app.models.code import CodeChunk
-from src.app.models.review import ReviewCategory, ReviewComment, Severity
+from src.app.models.review import ReviewCategory, ReviewComment, ReviewResponse, Severity
 
 
 class _TestOrchestrator:
+    __slots__ = ("_comments", "last_chunks")
+
     def __init__(self, comments: Iterable[ReviewComment]) -> None:
         self._comments = list(comments)
         self.last_chunks: list[CodeChunk] = []
@@ -21,23 +29,44 @@ class _TestOrchestrator:
         self.last_chunks = list(chunks)
         return list(self._comments)
 
+    async def review_stream(self, queue: asyncio.Queue[CodeChunk | None]) -> list[ReviewComment]:
+        while (chunk := await queue.get()) is not None:
+            self.last_chunks.append(chunk)
+        return list(self._comments)
+
 
 class _TestGitHubClient:
+    __slots__ = ("_diff", "calls")
+
     def __init__(self, diff: str) -> None:
         self._diff = diff
         self.calls: list[tuple[str, str, int]] = []
 
-    async def get_pull_request_diff(self, owner: str, repo: str, number: int) -> str:
+    async def stream_pull_request_diff(
+        self, owner: str, repo: str, number: int
+    ) -> AsyncIterator[bytes]:
         self.calls.append((owner, repo, number))
-        return self._diff
+        body = self._diff.encode()
+        # Small pieces so lines straddle chunk boundaries like a real stream
+        for start in range(0, len(body), 16):
+            yield body[start : start + 16]
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def client() -> Iterator[TestClient]:
+    # One app startup for the whole suite; overrides are reset per test below
     with TestClient(app) as test_client:
         yield test_client
 
 
+@pytest.fixture(autouse=True)
+def _deps_sandbox() -> Iterator[None]:
+    saved = app.dependency_overrides.copy()
+    yield
+    app.dependency_overrides.clear()
+    app.dependency_overrides.update(saved)
+
+
 def _make_comment() -> ReviewComment:
     return ReviewComment(
         file_path="src/app/example.py",
@@ -50,8 +79,7 @@ def _make_comment() -> ReviewComment:
     )
 
 
-def _diff_payload() -> str:
-    return """diff --git a/src/app/example.py b/src/app/example.py
+_DIFF_PAYLOAD: Final = """diff --git a/src/app/example.py b/src/app/example.py
 index 123..456 100644
 --- a/src/app/example.py
 +++ b/src/app/example.py
@@ -67,19 +95,11 @@ def _override_dependencies(orchestrator: Any, github_client: Any) -> None:
     dependencies_overrides[dependencies.get_github_client] = lambda: github_client
 
 
-def _clear_dependency_overrides() -> None:
-    app.dependency_overrides.pop(dependencies.get_agent_orchestrator, None)
-    app.dependency_overrides.pop(dependencies.get_github_client, None)
-
-
 def test_review_endpoint_with_manual_diff(client: TestClient) -> None:
     orchestrator = _TestOrchestrator([_make_comment()])
     _override_dependencies(orchestrator, None)
 
-    try:
-        response = client.post("/review/pr", json={"diff": _diff_payload()})
-    finally:
-        _clear_dependency_overrides()
+    response = client.post("/review/pr", json={"diff": _DIFF_PAYLOAD})
 
     assert response.status_code == 200
     data = response.json()
@@ -92,10 +112,7 @@ def test_review_endpoint_requires_input(client: TestClient) -> None:
     """Test that endpoint returns 422 for invalid input (Pydantic validation)."""
     _override_dependencies(_TestOrchestrator([]), None)
 
-    try:
-        response = client.post("/review/pr", json={})
-    finally:
-        _clear_dependency_overrides()
+    response = client.post("/review/pr", json={})
 
     assert response.status_code == 422  # Pydantic validation error
     data = response.json()
@@ -104,18 +121,132 @@ def test_review_endpoint_requires_input(client: TestClient) -> None:
 
 def test_review_endpoint_fetches_github_diff(client: TestClient) -> None:
     orchestrator = _TestOrchestrator([_make_comment()])
-    github_client = _TestGitHubClient(diff=_diff_payload())
+    github_client = _TestGitHubClient(diff=_DIFF_PAYLOAD)
     _override_dependencies(orchestrator, github_client)
 
-    try:
-        response = client.post(
-            "/review/pr",
-            json={"pr_id": 42, "repo": "octocat/hello-world"},
-        )
-    finally:
-        _clear_dependency_overrides()
+    response = client.post(
+        "/review/pr",
+        json={"pr_id": 42, "repo": "octocat/hello-world"},
+    )
 
     assert response.status_code == 200
     data = response.json()
     assert data["total_issues"] == 1
     assert github_client.calls == [("octocat", "hello-world", 42)]
+    assert [chunk.new_lines for chunk in orchestrator.last_chunks] == [["new_line"]]
+
+
+def test_review_endpoint_maps_streamed_fetch_failure_to_502(client: TestClient) -> None:
+    class _FailingGitHubClient(_TestGitHubClient):
+        __slots__ = ()
+
+        async def stream_pull_request_diff(
+            self, owner: str, repo: str, number: int
+        ) -> AsyncIterator[bytes]:
+            yield self._diff.encode()[:40]
+            raise GitHubClientError("connection reset", status_code=None)
+
+    _override_dependencies(_TestOrchestrator([]), _FailingGitHubClient(diff=_DIFF_PAYLOAD))
+
+    response = client.post(
+        "/review/pr",
+        json={"pr_id": 42, "repo": "octocat/hello-world"},
+    )
+
+    assert response.status_code == 502
+    assert response.json()["detail"] == "connection reset"
+
+
+def _poll_job(client: TestClient, job_id: str) -> dict[str, Any]:
+    for _ in range(100):
+        job = client.get(f"/review/pr/jobs/{job_id}").json()
+        if job["status"] in ("completed", "failed"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"review job {job_id} did not finish")
+
+
+def test_review_job_runs_in_background(client: TestClient) -> None:
+    orchestrator = _TestOrchestrator([_make_comment()])
+    github_client = _TestGitHubClient(diff=_DIFF_PAYLOAD)
+    jobs = ReviewJobStore()
+    _override_dependencies(orchestrator, github_client)
+    app.dependency_overrides[dependencies.get_review_jobs] = lambda: jobs
+
+    response = client.post("/review/pr/jobs", json={"pr_id": 7, "repo": "octocat/hello-world"})
+    assert response.status_code == 202
+    assert response.json()["status"] == "pending"
+    job = _poll_job(client, response.json()["job_id"])
+
+    assert job["status"] == "completed"
+    assert job["result"]["total_issues"] == 1
+    assert github_client.calls == [("octocat", "hello-world", 7)]
+
+
+@pytest.mark.anyio
+async def test_review_jobs_are_cancelled_on_close() -> None:
+    started = asyncio.Event()
+
+    async def hanging_review() -> ReviewResponse:
+        started.set()
+        await asyncio.Event().wait()
+        raise AssertionError("unreachable")
+
+    jobs = ReviewJobStore()
+    job = jobs.submit(hanging_review())
+    await started.wait()
+
+    await jobs.aclose()
+
+    assert job.status == JobStatus.FAILED
+    assert job.error == "Review cancelled at shutdown"
+
+
+def test_unknown_review_job_is_404(client: TestClient) -> None:
+    response = client.get("/review/pr/jobs/does-not-exist")
+
+    assert response.status_code == 404
+
+
+def _patch_settings(monkeypatch: pytest.MonkeyPatch, **overrides: Any) -> None:
+    # Settings are frozen, so the endpoint module gets an updated copy instead
+    patched = get_settings().model_copy(update=overrides)
+    monkeypatch.setattr("src.app.api.review.get_settings", lambda: patched)
+
+
+def test_review_endpoint_rejects_diff_over_line_limit(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _patch_settings(monkeypatch, max_diff_lines=3)
+    orchestrator = _TestOrchestrator([_make_comment()])
+    _override_dependencies(orchestrator, None)
+
+    response = client.post("/review/pr", json={"diff": _DIFF_PAYLOAD})
+
+    assert response.status_code == 413
+    assert response.json()["detail"] == "Diff exceeds maximum of 3 lines"
+    assert orchestrator.last_chunks == []
+
+
+def test_review_endpoint_aborts_oversized_streamed_diff(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _patch_settings(monkeypatch, max_diff_size_bytes=1000)
+    _override_dependencies(_TestOrchestrator([]), _TestGitHubClient(diff=_DIFF_PAYLOAD * 20))
+
+    response = client.post(
+        "/review/pr",
+        json={"pr_id": 42, "repo": "octocat/hello-world"},
+    )
+
+    assert response.status_code == 413
+    assert response.json()["detail"] == "Diff exceeds maximum size of 1 KB"
+
+
+def test_close_llm_client_releases_shared_pool() -> None:
+    llm_client = dependencies.get_llm_client()
+
+    asyncio.run(dependencies.close_llm_client())
+
+    assert llm_client._client.is_closed
+    assert dependencies.get_llm_client.cache_info().currsize == 0
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import asyncio
+import json
+
 import pytest
 
 from src.app.agents import (
@@ -7,9 +10,11 @@ from src.app.agents import (
     BaseAgent,
     LogicAgent,
     PerformanceAgent,
+    PromptContext,
     ReadabilityAgent,
     SecurityAgent,
 )
+from src.app.agents._llm_json import LLMJsonAgent
 from src.app.llm.client import FakeLLMClient
 from src.app.models.base import Language
 from src.app.models.code import CodeChunk
@@ -44,7 +49,7 @@ class TestBaseAgent:
 
 
 class TestAgentOrchestrator:
-    @pytest.mark.asyncio
+    @pytest.mark.anyio
     async def test_orchestrator_aggregates_comments(self) -> None:
         chunk = CodeChunk(
             file_path="src/app/example.py",
@@ -68,49 +73,350 @@ class TestAgentOrchestrator:
         assert "first issue in src/app/example.py" in messages
         assert "second issue in src/app/example.py" in messages
 
-    @pytest.mark.asyncio
+    @pytest.mark.anyio
+    async def test_orchestrator_analyzes_identical_chunks_once(self) -> None:
+        calls: list[str] = []
+
+        class CountingAgent(DummyAgent):
+            async def analyze(self, chunk: CodeChunk) -> list[ReviewComment]:
+                calls.append(chunk.file_path)
+                return await super().analyze(chunk)
+
+        first = CodeChunk(
+            file_path="src/app/a.py",
+            language=Language.PYTHON,
+            new_lines=["moved = True"],
+            start_line=3,
+        )
+        moved = first.model_copy(update={"file_path": "src/app/b.py", "start_line": 40})
+
+        orchestrator = AgentOrchestrator([CountingAgent(name="a1", label="dup")])
+        comments = await orchestrator.review([first, moved])
+
+        assert calls == ["src/app/a.py"]
+        assert [(c.file_path, c.line_number) for c in comments] == [
+            ("src/app/a.py", 3),
+            ("src/app/b.py", 40),
+        ]
+
+    @pytest.mark.anyio
+    async def test_orchestrator_bounds_concurrent_agent_calls(self) -> None:
+        active = 0
+        peak = 0
+
+        class SlowAgent(DummyAgent):
+            async def analyze(self, chunk: CodeChunk) -> list[ReviewComment]:
+                nonlocal active, peak
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+                return []
+
+        chunks = [
+            CodeChunk(file_path=f"src/app/f{i}.py", new_lines=[f"x = {i}"], start_line=1)
+            for i in range(6)
+        ]
+        agents: list[BaseAgent] = [SlowAgent(name=f"a{i}", label="slow") for i in range(3)]
+
+        await AgentOrchestrator(agents, concurrency=2).review(chunks)
+
+        assert peak == 2
+
+    @pytest.mark.anyio
+    async def test_orchestrator_emits_chunks_in_completion_order(self) -> None:
+        class LatencyAgent(DummyAgent):
+            async def analyze(self, chunk: CodeChunk) -> list[ReviewComment]:
+                await asyncio.sleep(0.02 if chunk.file_path.endswith("slow.py") else 0)
+                return await super().analyze(chunk)
+
+        chunks = [
+            CodeChunk(file_path="src/app/slow.py", new_lines=["a = 1"], start_line=1),
+            CodeChunk(file_path="src/app/fast.py", new_lines=["b = 2"], start_line=1),
+        ]
+
+        comments = await AgentOrchestrator([LatencyAgent(name="a1", label="x")]).review(chunks)
+
+        assert [c.file_path for c in comments] == ["src/app/fast.py", "src/app/slow.py"]
+
+    @pytest.mark.anyio
+    async def test_orchestrator_skips_non_code_chunks(self) -> None:
+        chunks = [
+            CodeChunk(file_path="src/app/blank.py", new_lines=["", "   "], start_line=1),
+            CodeChunk(
+                file_path="src/app/notes.py",
+                language=Language.PYTHON,
+                new_lines=["# TODO: tidy up", "", "#   later"],
+                start_line=1,
+            ),
+            CodeChunk(
+                file_path="src/app/real.py",
+                language=Language.PYTHON,
+                new_lines=["# guard", "x = 1"],
+                start_line=1,
+            ),
+        ]
+
+        comments = await AgentOrchestrator([DummyAgent(name="a1", label="x")]).review(chunks)
+
+        assert [c.file_path for c in comments] == ["src/app/real.py"]
+
+    @pytest.mark.anyio
+    async def test_orchestrator_reviews_short_and_star_prefixed_code(self) -> None:
+        def c_chunk(name: str, *lines: str) -> CodeChunk:
+            return CodeChunk(
+                file_path=f"src/{name}.c", language=Language.C, new_lines=list(lines), start_line=1
+            )
+
+        chunks = [
+            c_chunk("decrement", "i--"),
+            c_chunk("brace", "}"),
+            c_chunk("deref", "* ptr = 0;"),
+            c_chunk("docblock", "/**", " * Frees the buffer.", " */"),
+            c_chunk("tail", " * opened above this hunk", " */"),
+            c_chunk("inline", "/* reset */ count = 0;"),
+        ]
+
+        comments = await AgentOrchestrator([DummyAgent(name="a1", label="x")]).review(chunks)
+
+        assert sorted(c.file_path for c in comments) == [
+            "src/brace.c",
+            "src/decrement.c",
+            "src/deref.c",
+            "src/inline.c",
+        ]
+
+    @pytest.mark.anyio
+    async def test_orchestrator_isolates_failing_chunk(self) -> None:
+        class FlakyAgent(DummyAgent):
+            async def analyze(self, chunk: CodeChunk) -> list[ReviewComment]:
+                if chunk.file_path.endswith("broken.py"):
+                    raise RuntimeError("provider returned 502")
+                return await super().analyze(chunk)
+
+        chunks = [
+            CodeChunk(file_path="src/app/broken.py", new_lines=["a = 1"], start_line=1),
+            CodeChunk(file_path="src/app/ok.py", new_lines=["b = 2"], start_line=1),
+        ]
+
+        comments = await AgentOrchestrator([FlakyAgent(name="a1", label="x")]).review(chunks)
+
+        assert [c.file_path for c in comments] == ["src/app/ok.py"]
+
+    @pytest.mark.anyio
+    async def test_review_stream_starts_before_producer_finishes(self) -> None:
+        analyzed = asyncio.Event()
+
+        class SignallingAgent(DummyAgent):
+            async def analyze(self, chunk: CodeChunk) -> list[ReviewComment]:
+                analyzed.set()
+                return await super().analyze(chunk)
+
+        first = CodeChunk(file_path="src/app/a.py", new_lines=["x = 1"], start_line=2)
+        moved = first.model_copy(update={"file_path": "src/app/b.py", "start_line": 20})
+        queue: asyncio.Queue[CodeChunk | None] = asyncio.Queue()
+        orchestrator = AgentOrchestrator([SignallingAgent(name="a1", label="x")])
+        consumer = asyncio.create_task(orchestrator.review_stream(queue))
+
+        queue.put_nowait(first)
+        await asyncio.wait_for(analyzed.wait(), timeout=1)
+        assert not consumer.done()
+        queue.put_nowait(moved)
+        queue.put_nowait(None)
+
+        comments = await consumer
+        assert [(c.file_path, c.line_number) for c in comments] == [
+            ("src/app/a.py", 2),
+            ("src/app/b.py", 20),
+        ]
+
+    @pytest.mark.anyio
+    async def test_review_stream_deduplicates_across_agents(self) -> None:
+        chunk = CodeChunk(file_path="src/app/a.py", new_lines=["x = 1"], start_line=2)
+        queue: asyncio.Queue[CodeChunk | None] = asyncio.Queue()
+        for item in (chunk, None):
+            queue.put_nowait(item)
+        orchestrator = AgentOrchestrator(
+            [DummyAgent(name="a1", label="same"), DummyAgent(name="a2", label="same")]
+        )
+
+        comments = await orchestrator.review_stream(queue)
+
+        assert [(c.message, c.agent_name) for c in comments] == [
+            ("same issue in src/app/a.py", "a1")
+        ]
+
+    @pytest.mark.anyio
     async def test_orchestrator_handles_empty_chunks(self) -> None:
         orchestrator = AgentOrchestrator([])
         comments = await orchestrator.review([])
         assert comments == []
 
 
-class TestConcreteAgents:
-    @pytest.fixture()
-    def fake_llm(self) -> FakeLLMClient:
-        return FakeLLMClient(responses={})
+class _RecordingLLM:
+    """LLM double that returns a fixed response and records every prompt."""
+
+    def __init__(self, response: str) -> None:
+        self._response = response
+        self.prompts: list[str] = []
 
+    async def generate(
+        self, prompt: str, temperature: float | None = None, max_tokens: int | None = None
+    ) -> str:
+        self.prompts.append(prompt)
+        return self._response
+
+
+class TestBatchedOrchestration:
     @pytest.fixture()
     def chunk(self) -> CodeChunk:
         return CodeChunk(
             file_path="src/app/example.py",
             language=Language.PYTHON,
-            original_lines=["old"],
-            new_lines=["new"],
-            start_line=1,
-            end_line=2,
+            original_lines=[],
+            new_lines=["x = 1", "y = x / 0"],
+            start_line=5,
+            end_line=6,
         )
 
-    @pytest.mark.asyncio
-    async def test_logic_agent_runs_with_fake_llm(self, fake_llm: FakeLLMClient, chunk: CodeChunk) -> None:
-        agent = LogicAgent(llm=fake_llm)
-        comments = await agent.analyze(chunk)
-        assert isinstance(comments, list)
+    @pytest.mark.anyio
+    async def test_fused_prompt_issues_single_llm_call(self, chunk: CodeChunk) -> None:
+        fused = {
+            "logic": [{"line": 6, "severity": "critical", "message": "Division by zero"}],
+            "readability": [],
+            "performance": [],
+            "security": [{"line": 5, "severity": "warning", "message": "Magic constant"}],
+        }
+        llm = _RecordingLLM(json.dumps(fused))
+        agents: list[BaseAgent] = [
+            LogicAgent(llm=llm),
+            ReadabilityAgent(llm=llm),
+            PerformanceAgent(llm=llm),
+            SecurityAgent(llm=llm),
+        ]
 
-    @pytest.mark.asyncio
-    async def test_readability_agent_runs_with_fake_llm(self, fake_llm: FakeLLMClient, chunk: CodeChunk) -> None:
-        agent = ReadabilityAgent(llm=fake_llm)
-        comments = await agent.analyze(chunk)
-        assert isinstance(comments, list)
+        comments = await AgentOrchestrator(agents, llm=llm).review([chunk])
 
-    @pytest.mark.asyncio
-    async def test_performance_agent_runs_with_fake_llm(self, fake_llm: FakeLLMClient, chunk: CodeChunk) -> None:
-        agent = PerformanceAgent(llm=fake_llm)
-        comments = await agent.analyze(chunk)
-        assert isinstance(comments, list)
+        assert len(llm.prompts) == 1
+        by_agent = {c.agent_name: c for c in comments}
+        assert set(by_agent) == {"logic", "security"}
+        assert by_agent["logic"].line_number == 6
+        assert by_agent["logic"].severity == Severity.CRITICAL
+        assert by_agent["security"].line_number == 5
+
+    @pytest.mark.anyio
+    async def test_fused_prompt_shows_code_once_without_array_instructions(
+        self, chunk: CodeChunk
+    ) -> None:
+        llm = _RecordingLLM(json.dumps({"logic": [], "security": []}))
+        agents: list[BaseAgent] = [LogicAgent(llm=llm), SecurityAgent(llm=llm)]
+
+        await AgentOrchestrator(agents, llm=llm).review([chunk])
+
+        (prompt,) = llm.prompts
+        assert prompt.count(PromptContext.from_chunk(chunk).code) == 1
+        assert "JSON array with this exact structure" not in prompt
+        assert "Return ONLY valid JSON" not in prompt
+        assert '"logic", "security"' in prompt
+
+    @pytest.mark.anyio
+    async def test_missing_section_falls_back_to_agent_call(self, chunk: CodeChunk) -> None:
+        llm = _RecordingLLM(json.dumps({"logic": []}))
+        agents: list[BaseAgent] = [LogicAgent(llm=llm), SecurityAgent(llm=llm)]
+
+        comments = await AgentOrchestrator(agents, llm=llm).review([chunk])
+
+        assert comments == []
+        # One fused call plus one per-agent retry for the missing "security" key
+        assert len(llm.prompts) == 2
 
-    @pytest.mark.asyncio
-    async def test_security_agent_runs_with_fake_llm(self, fake_llm: FakeLLMClient, chunk: CodeChunk) -> None:
-        agent = SecurityAgent(llm=fake_llm)
-        comments = await agent.analyze(chunk)
+    @pytest.mark.anyio
+    async def test_agents_without_prompts_run_directly(self, chunk: CodeChunk) -> None:
+        llm = _RecordingLLM("[]")
+        agents: list[BaseAgent] = [DummyAgent(name="a1", label="first"), LogicAgent(llm=llm)]
+
+        comments = await AgentOrchestrator(agents, llm=llm).review([chunk])
+
+        assert [c.agent_name for c in comments] == ["a1"]
+        assert len(llm.prompts) == 1
+
+
+@pytest.fixture(scope="module")
+def fake_llm() -> FakeLLMClient:
+    # Stateless with no canned responses, so one instance serves every agent test
+    return FakeLLMClient(responses={})
+
+
+@pytest.fixture(scope="module")
+def chunk() -> CodeChunk:
+    # CodeChunk is frozen, so every agent test can share this one instance;
+    # a test needing a variant should model_copy(update=...) it locally
+    return CodeChunk(
+        file_path="src/app/example.py",
+        language=Language.PYTHON,
+        original_lines=["old"],
+        new_lines=["new"],
+        start_line=1,
+        end_line=2,
+    )
+
+
+class TestConcreteAgents:
+    @pytest.mark.parametrize(
+        "agent_cls",
+        [LogicAgent, ReadabilityAgent, PerformanceAgent, SecurityAgent],
+        ids=["logic", "readability", "performance", "security"],
+    )
+    @pytest.mark.anyio
+    async def test_agent_runs_with_fake_llm(
+        self, agent_cls: type[LLMJsonAgent], fake_llm: FakeLLMClient, chunk: CodeChunk
+    ) -> None:
+        comments = await agent_cls(llm=fake_llm).analyze(chunk)
         assert isinstance(comments, list)
+
+    def test_shared_prompt_context_matches_per_agent_rendering(self, chunk: CodeChunk) -> None:
+        ctx = PromptContext.from_chunk(chunk)
+        for agent_cls in (LogicAgent, ReadabilityAgent, PerformanceAgent, SecurityAgent):
+            agent = agent_cls(llm=None)
+            prompt = agent.build_prompt(chunk, ctx)
+            assert prompt == agent.build_prompt(chunk)
+            assert ctx.section in prompt
+
+    @pytest.mark.parametrize("response", ["[]", "  []\n", "```json\n[]\n```", "```\n```"])
+    def test_empty_issue_list_short_circuits(self, chunk: CodeChunk, response: str) -> None:
+        for agent_cls in (LogicAgent, ReadabilityAgent, PerformanceAgent, SecurityAgent):
+            assert agent_cls(llm=None).parse_response(response, chunk) == []
+
+    def test_fenced_response_is_unwrapped(self, chunk: CodeChunk) -> None:
+        response = '```json\n[{"line": 1, "severity": "warning", "message": "Unused"}]\n```'
+        for agent_cls in (LogicAgent, ReadabilityAgent, PerformanceAgent, SecurityAgent):
+            comments = agent_cls(llm=None).parse_response(response, chunk)
+            assert [c.message for c in comments] == ["Unused"]
+
+    def test_prompt_excerpts_added_lines_with_file_line_numbers(self) -> None:
+        chunk = CodeChunk(
+            file_path="src/app/example.py",
+            language=Language.PYTHON,
+            new_lines=[f"line_{i} = {i}" for i in range(12)] + ["added = True"],
+            changed_line_indices=[12],
+            start_line=100,
+        )
+
+        code = PromptContext.from_chunk(chunk).code
+
+        assert code.splitlines() == [
+            "   109: line_9 = 9",
+            "   110: line_10 = 10",
+            "   111: line_11 = 11",
+            "+  112: added = True",
+        ]
+
+    def test_malformed_issue_only_drops_itself(self, chunk: CodeChunk) -> None:
+        issues = [
+            {"line": 1, "severity": "warning", "message": "First"},
+            "not an issue",
+            {"line": 2, "severity": "warning", "message": "Second"},
+        ]
+        for agent_cls in (LogicAgent, ReadabilityAgent, PerformanceAgent, SecurityAgent):
+            comments = agent_cls(llm=None).parse_response(issues, chunk)
+            assert [c.message for c in comments] == ["First", "Second"]
@@ -1,22 +1,16 @@
 """Tests for unified diff parsing utilities."""
 
 from pathlib import Path
+from typing import Final
 
 import pytest
 
-from src.app.diff.parser import parse_unified_diff
+from src.app.diff.parser import _suffix, filter_supported_files, parse_unified_diff
+from src.app.diff.stream import iter_unified_diff
 from src.app.models.base import Language
+from src.app.models.code import FileDiff
 
-FIXTURE_DIR = Path(__file__).resolve().parents[1] / "fixtures"
-
-
-class TestParseUnifiedDiff:
-    """Behavioral tests for ``parse_unified_diff``."""
-
-    def test_modified_file_reports_counts_and_chunks(self) -> None:
-        """Modified files should track additions/deletions and chunk metadata."""
-
-        diff = """diff --git a/src/app/example.py b/src/app/example.py
+_DIFF_MODIFIED: Final = """diff --git a/src/app/example.py b/src/app/example.py
 index 1111111..2222222 100644
 --- a/src/app/example.py
 +++ b/src/app/example.py
@@ -27,7 +21,60 @@ index 1111111..2222222 100644
 
 """
 
-        file_diffs = parse_unified_diff(diff)
+_DIFF_ADDED: Final = """diff --git a/src/app/new_file.py b/src/app/new_file.py
+new file mode 100644
+index 0000000..3333333
+--- /dev/null
++++ b/src/app/new_file.py
+@@ -0,0 +1,2 @@
++def added():
++    return True
+"""
+
+_DIFF_DELETED: Final = """diff --git a/src/app/old_file.py b/src/app/old_file.py
+deleted file mode 100644
+index 4444444..0000000
+--- a/src/app/old_file.py
++++ /dev/null
+@@ -1,2 +0,0 @@
+-def removed():
+-    pass
+"""
+
+_DIFF_RENAMED: Final = """diff --git a/src/app/old_name.py b/src/app/new_name.py
+similarity index 100%
+rename from src/app/old_name.py
+rename to src/app/new_name.py
+--- a/src/app/old_name.py
++++ b/src/app/new_name.py
+@@ -1,2 +1,2 @@
+-def foo():
+-    return 1
++def bar():
++    return 1
+"""
+
+
+@pytest.fixture(scope="session")
+def real_world_diff_text() -> str:
+    """The multi-file fixture diff, read from disk once per session."""
+    fixture_path = Path(__file__).resolve().parents[1] / "fixtures" / "real_world_pr.diff"
+    return fixture_path.read_text(encoding="utf-8")
+
+
+@pytest.fixture(scope="session")
+def real_world_file_diffs(real_world_diff_text: str) -> list[FileDiff]:
+    """The fixture diff parsed once per session; tests must not mutate it."""
+    return parse_unified_diff(real_world_diff_text)
+
+
+class TestParseUnifiedDiff:
+    """Behavioral tests for ``parse_unified_diff``."""
+
+    def test_modified_file_reports_counts_and_chunks(self) -> None:
+        """Modified files should track additions/deletions and chunk metadata."""
+
+        file_diffs = parse_unified_diff(_DIFF_MODIFIED)
 
         assert len(file_diffs) == 1
         file_diff = file_diffs[0]
@@ -41,21 +88,12 @@ index 1111111..2222222 100644
         assert chunk.start_line == 1
         assert "    return 2" in chunk.new_lines
         assert "    return 1" in chunk.original_lines
+        assert [chunk.new_lines[i] for i in chunk.changed_line_indices] == ["    return 2"]
 
     def test_added_file_detected(self) -> None:
         """A diff against ``/dev/null`` should be flagged as an added file."""
 
-        diff = """diff --git a/src/app/new_file.py b/src/app/new_file.py
-new file mode 100644
-index 0000000..3333333
---- /dev/null
-+++ b/src/app/new_file.py
-@@ -0,0 +1,2 @@
-+def added():
-+    return True
-"""
-
-        file_diffs = parse_unified_diff(diff)
+        file_diffs = parse_unified_diff(_DIFF_ADDED)
 
         assert len(file_diffs) == 1
         file_diff = file_diffs[0]
@@ -72,17 +110,7 @@ index 0000000..3333333
     def test_deleted_file_detected(self) -> None:
         """When the new path is ``/dev/null`` the file should be marked deleted."""
 
-        diff = """diff --git a/src/app/old_file.py b/src/app/old_file.py
-deleted file mode 100644
-index 4444444..0000000
---- a/src/app/old_file.py
-+++ /dev/null
-@@ -1,2 +0,0 @@
--def removed():
--    pass
-"""
-
-        file_diffs = parse_unified_diff(diff)
+        file_diffs = parse_unified_diff(_DIFF_DELETED)
 
         assert len(file_diffs) == 1
         file_diff = file_diffs[0]
@@ -97,20 +125,7 @@ index 4444444..0000000
     def test_rename_reports_new_path(self) -> None:
         """Renames should record the new path and report renamed status."""
 
-        diff = """diff --git a/src/app/old_name.py b/src/app/new_name.py
-similarity index 100%
-rename from src/app/old_name.py
-rename to src/app/new_name.py
---- a/src/app/old_name.py
-+++ b/src/app/new_name.py
-@@ -1,2 +1,2 @@
--def foo():
--    return 1
-+def bar():
-+    return 1
-"""
-
-        file_diffs = parse_unified_diff(diff)
+        file_diffs = parse_unified_diff(_DIFF_RENAMED)
 
         assert len(file_diffs) == 1
         file_diff = file_diffs[0]
@@ -135,13 +150,10 @@ def test_empty_input_returns_empty_list(raw_diff: str) -> None:
     assert parse_unified_diff(raw_diff) == []
 
 
-def test_real_world_fixture_parses_multiple_files() -> None:
+def test_real_world_fixture_parses_multiple_files(real_world_file_diffs: list[FileDiff]) -> None:
     """Parsing should succeed on the multi-file fixture diff."""
 
-    fixture_path = FIXTURE_DIR / "real_world_pr.diff"
-    diff_text = fixture_path.read_text(encoding="utf-8")
-
-    file_diffs = parse_unified_diff(diff_text)
+    file_diffs = real_world_file_diffs
 
     assert len(file_diffs) == 2
     paths = {file_diff.file_path for file_diff in file_diffs}
@@ -156,3 +168,59 @@ def test_real_world_fixture_parses_multiple_files() -> None:
     cache_diff = next(fd for fd in file_diffs if fd.file_path == "src/app/services/cache.py")
     assert cache_diff.status == "modified"
     assert cache_diff.additions >= 0
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+async def test_streamed_parse_matches_buffered_parse(
+    chunk_size: int, real_world_diff_text: str, real_world_file_diffs: list[FileDiff]
+) -> None:
+    """Feeding the diff in arbitrary byte chunks should give the same result."""
+
+    body = real_world_diff_text.encode("utf-8")
+
+    async def chunks():
+        for start in range(0, len(body), chunk_size):
+            yield body[start : start + chunk_size]
+
+    streamed = [file_diff async for file_diff in iter_unified_diff(chunks())]
+
+    assert streamed == real_world_file_diffs
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "src/app/main.py",
+        "web/App.TSX",
+        "Makefile",
+        ".github/.env",
+        "pkg.v2/README",
+        "archive.tar.gz",
+        "trailing.",
+    ],
+)
+def test_suffix_matches_pathlib(path: str) -> None:
+    """The string-slicing suffix helper must agree with ``Path.suffix``."""
+
+    assert _suffix(path) == Path(path).suffix.lower()
+
+
+def test_filter_supported_files_skips_binary_and_unsupported() -> None:
+    """Binary and unsupported extensions are reported as ignored."""
+
+    diff = "".join(
+        f"""diff --git a/{path} b/{path}
+--- a/{path}
++++ b/{path}
+@@ -1,1 +1,1 @@
+-old
++new
+"""
+        for path in ("assets/Logo.PNG", "docs/notes.txt", "src/app/main.py")
+    )
+
+    supported, ignored = filter_supported_files(parse_unified_diff(diff))
+
+    assert [file_diff.file_path for file_diff in supported] == ["src/app/main.py"]
+    assert ignored == ["assets/Logo.PNG (binary)", "docs/notes.txt (unsupported: .txt)"]
@@ -0,0 +1,37 @@
+"""Throughput benchmarks for the diff parser entry points (pytest-benchmark)."""
+
+from pathlib import Path
+
+import pytest
+
+from src.app.diff.parser import IncrementalDiffParser, parse_unified_diff
+from src.app.models.code import FileDiff
+
+# Enough copies of the real-world fixture to make per-call overhead negligible
+_REPEATS = 200
+
+
+@pytest.fixture(scope="module")
+def large_diff_text() -> str:
+    fixture_path = Path(__file__).resolve().parents[1] / "fixtures" / "real_world_pr.diff"
+    # The fixture has no trailing newline; join so each copy starts a fresh file header
+    return "\n".join([fixture_path.read_text(encoding="utf-8")] * _REPEATS)
+
+
+def _parse_bytes(data: bytes) -> list[FileDiff]:
+    parser = IncrementalDiffParser()
+    return parser.feed(data) + parser.close()
+
+
+def test_bench_parse_str(benchmark, large_diff_text: str) -> None:
+    file_diffs = benchmark(parse_unified_diff, large_diff_text)
+
+    assert len(file_diffs) == 2 * _REPEATS
+
+
+def test_bench_parse_bytes(benchmark, large_diff_text: str) -> None:
+    data = large_diff_text.encode("utf-8")
+
+    file_diffs = benchmark(_parse_bytes, data)
+
+    assert file_diffs == parse_unified_diff(large_diff_text)
@@ -1,27 +1,144 @@
 from __future__ import annotations
 
-from collections.abc import Callable
+import asyncio
+import string
+from collections.abc import AsyncIterator, Callable
+from pathlib import Path
 from typing import Any
+from unittest.mock import AsyncMock, patch
 
 import httpx
 import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
 
-from src.app.github.client import GitHubClient, GitHubClientError
+from src.app.github.cache import CachedResponse, ETagCache
+from src.app.github.client import STREAM_CHUNK_SIZE, GitHubClient, GitHubClientError
+from src.app.github.ratelimit import RateLimiter
 
 
 def _build_transport(handler: Callable[[httpx.Request], httpx.Response]) -> httpx.MockTransport:
     return httpx.MockTransport(handler)
 
 
-@pytest.mark.asyncio
-async def test_get_pull_request_diff_success() -> None:
-    expected_diff = "diff --git a/src/app/example.py b/src/app/example.py"
+_DIFF_ACCEPT = "application/vnd.github.v3.diff"
+_PATCH_ACCEPT = "application/vnd.github.v3.patch"
+_JSON_ACCEPT = "application/vnd.github+json"
+_REPO = "/repos/octocat/hello-world"
+
+# (method, args, kwargs, path, accept, body) for calls that succeed; str bodies are
+# served as text, everything else as JSON
+_SUCCESS_ROUTES = [
+    pytest.param(
+        "get_pull_request_diff",
+        ("octocat", "hello-world", 42),
+        {},
+        f"{_REPO}/pulls/42",
+        _DIFF_ACCEPT,
+        "diff --git a/src/app/example.py b/src/app/example.py",
+        id="diff",
+    ),
+    pytest.param(
+        "get_pull_request_patch",
+        ("octocat", "hello-world", 5),
+        {},
+        f"{_REPO}/pulls/5",
+        _PATCH_ACCEPT,
+        "diff --git a/foo b/foo",
+        id="patch",
+    ),
+    pytest.param(
+        "get_pull_request",
+        ("octocat", "hello-world", 42),
+        {},
+        f"{_REPO}/pulls/42",
+        _JSON_ACCEPT,
+        {"number": 42, "title": "Add feature"},
+        id="metadata",
+    ),
+    pytest.param(
+        "list_pull_requests",
+        ("octocat", "hello-world"),
+        {"state": "closed", "per_page": 10, "page": 2},
+        f"{_REPO}/pulls",
+        _JSON_ACCEPT,
+        [{"number": 1, "title": "First"}, {"number": 2, "title": "Second"}],
+        id="list",
+    ),
+    pytest.param(
+        "get_pull_request_files",
+        ("octocat", "hello-world", 7),
+        {},
+        f"{_REPO}/pulls/7/files",
+        _JSON_ACCEPT,
+        [
+            {
+                "filename": "src/app/example.py",
+                "status": "modified",
+                "additions": 3,
+                "deletions": 1,
+                "changes": 4,
+            }
+        ],
+        id="files",
+    ),
+    pytest.param(
+        "get_pull_request_commits",
+        ("octocat", "hello-world", 7),
+        {},
+        f"{_REPO}/pulls/7/commits",
+        _JSON_ACCEPT,
+        [{"sha": "abc", "commit": {"message": "Initial"}}],
+        id="commits",
+    ),
+]
+
+# (method, args, path, accept, status, message) for calls GitHub rejects
+_ERROR_ROUTES = [
+    pytest.param(
+        "get_pull_request_diff",
+        ("octocat", "hello-world", 99),
+        f"{_REPO}/pulls/99",
+        _DIFF_ACCEPT,
+        404,
+        "Not Found",
+        id="diff-not-found",
+    ),
+    pytest.param(
+        "list_pull_requests",
+        ("octocat", "private"),
+        "/repos/octocat/private/pulls",
+        _JSON_ACCEPT,
+        403,
+        "Forbidden",
+        id="list-forbidden",
+    ),
+]
+
+
+def _route_table() -> dict[tuple[str, str], tuple[int, Any]]:
+    table: dict[tuple[str, str], tuple[int, Any]] = {}
+    for route in _SUCCESS_ROUTES:
+        _, _, _, path, accept, body = route.values
+        table[(path, accept)] = (200, body)
+    for route in _ERROR_ROUTES:
+        _, _, path, accept, status, message = route.values
+        table[(path, accept)] = (status, {"message": message})
+    return table
+
+
+@pytest.fixture(scope="module")
+async def routed_client() -> AsyncIterator[tuple[GitHubClient, list[httpx.Request]]]:
+    """One client for every table-driven test, dispatching on path and Accept."""
+    table = _route_table()
+    requests: list[httpx.Request] = []
 
     def handler(request: httpx.Request) -> httpx.Response:
-        assert request.headers.get("accept") == "application/vnd.github.v3.diff"
-        assert request.headers.get("authorization") == "Bearer test-token"
-        assert request.url.path == "/repos/octocat/hello-world/pulls/42"
-        return httpx.Response(status_code=200, text=expected_diff)
+        requests.append(request)
+        status, body = table[(request.url.path, request.headers["accept"])]
+        if isinstance(body, str):
+            return httpx.Response(status_code=status, text=body)
+        return httpx.Response(status_code=status, json=body)
 
     client = GitHubClient(
         token="test-token",
@@ -29,17 +146,68 @@ async def test_get_pull_request_diff_success() -> None:
         timeout=5.0,
         transport=_build_transport(handler),
     )
-
     async with client:
-        diff = await client.get_pull_request_diff("octocat", "hello-world", 42)
+        yield client, requests
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(("method", "args", "kwargs", "path", "accept", "body"), _SUCCESS_ROUTES)
+async def test_endpoint_success(
+    routed_client: tuple[GitHubClient, list[httpx.Request]],
+    method: str,
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+    path: str,
+    accept: str,
+    body: Any,
+) -> None:
+    client, requests = routed_client
+
+    result = await getattr(client, method)(*args, **kwargs)
+
+    assert result == body
+    request = requests[-1]
+    assert request.url.path == path
+    assert request.headers.get("accept") == accept
+    assert request.headers.get("authorization") == "Bearer test-token"
+    # Query params are strings in the URL
+    assert {k: request.url.params[k] for k in kwargs} == {k: str(v) for k, v in kwargs.items()}
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(("method", "args", "path", "accept", "status", "message"), _ERROR_ROUTES)
+async def test_endpoint_error(
+    routed_client: tuple[GitHubClient, list[httpx.Request]],
+    method: str,
+    args: tuple[Any, ...],
+    path: str,
+    accept: str,
+    status: int,
+    message: str,
+) -> None:
+    client, requests = routed_client
+
+    with pytest.raises(GitHubClientError) as exc_info:
+        await getattr(client, method)(*args)
+
+    assert (requests[-1].url.path, requests[-1].headers.get("accept")) == (path, accept)
+    assert exc_info.value.status_code == status
+    assert message in str(exc_info.value)
+
+
+_SLUG = st.text(alphabet=string.ascii_letters + string.digits + "-_", min_size=1, max_size=39)
 
-    assert diff == expected_diff
 
+@pytest.fixture(scope="module")
+async def echo_client() -> AsyncIterator[tuple[GitHubClient, list[httpx.Request]]]:
+    """One client that answers any request with an empty body of the asked-for type."""
+    requests: list[httpx.Request] = []
 
-@pytest.mark.asyncio
-async def test_get_pull_request_diff_raises_for_not_found() -> None:
     def handler(request: httpx.Request) -> httpx.Response:
-        return httpx.Response(status_code=404, json={"message": "Not Found"})
+        requests.append(request)
+        if request.headers["accept"] == _JSON_ACCEPT:
+            return httpx.Response(status_code=200, json=[])
+        return httpx.Response(status_code=200, text="")
 
     client = GitHubClient(
         token="test-token",
@@ -47,78 +215,242 @@ async def test_get_pull_request_diff_raises_for_not_found() -> None:
         timeout=5.0,
         transport=_build_transport(handler),
     )
+    async with client:
+        yield client, requests
+
+
+@pytest.mark.anyio
+@settings(max_examples=50, deadline=None)
+@given(owner=_SLUG, repo=_SLUG, number=st.integers(min_value=1, max_value=10_000))
+async def test_pull_request_urls_are_built_from_any_slug(
+    echo_client: tuple[GitHubClient, list[httpx.Request]], owner: str, repo: str, number: int
+) -> None:
+    client, requests = echo_client
+
+    await client.get_pull_request_diff(owner, repo, number)
+    await client.get_pull_request_patch(owner, repo, number)
+
+    diff_request, patch_request = requests[-2:]
+    expected_path = f"/repos/{owner}/{repo}/pulls/{number}"
+    assert diff_request.url.path == patch_request.url.path == expected_path
+    assert diff_request.headers["accept"] == _DIFF_ACCEPT
+    assert patch_request.headers["accept"] == _PATCH_ACCEPT
+
+
+@pytest.mark.anyio
+@settings(max_examples=50, deadline=None)
+@given(
+    owner=_SLUG,
+    repo=_SLUG,
+    state=st.sampled_from(["open", "closed", "all"]),
+    per_page=st.integers(min_value=1, max_value=100),
+    page=st.integers(min_value=1, max_value=1_000),
+)
+async def test_list_pull_requests_forwards_paging(
+    echo_client: tuple[GitHubClient, list[httpx.Request]],
+    owner: str,
+    repo: str,
+    state: str,
+    per_page: int,
+    page: int,
+) -> None:
+    client, requests = echo_client
+
+    assert (
+        await client.list_pull_requests(owner, repo, state=state, per_page=per_page, page=page)
+        == []
+    )
 
-    with pytest.raises(GitHubClientError) as exc_info:
-        async with client:
-            await client.get_pull_request_diff("octocat", "hello-world", 99)
+    request = requests[-1]
+    assert request.url.path == f"/repos/{owner}/{repo}/pulls"
+    assert request.headers["accept"] == _JSON_ACCEPT
+    assert dict(request.url.params) == {
+        "state": state,
+        "per_page": str(per_page),
+        "page": str(page),
+    }
 
-    assert exc_info.value.status_code == 404
-    assert "Not Found" in str(exc_info.value)
 
+@pytest.mark.anyio
+async def test_client_reuses_connection_pool_until_closed() -> None:
+    seen: list[str] = []
 
-@pytest.mark.asyncio
-async def test_get_pull_request_metadata_success() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.path)
+        return httpx.Response(status_code=200, json={"number": 1})
+
+    client = GitHubClient(
+        token=None,
+        base_url="https://api.github.com",
+        timeout=5.0,
+        transport=_build_transport(handler),
+    )
+
+    async with client:
+        await client.get_pull_request("octocat", "hello-world", 1)
+        await client.get_pull_request("octocat", "hello-world", 2)
+        assert client.is_closed is False
+
+    assert client.is_closed is True
+    assert seen == ["/repos/octocat/hello-world/pulls/1", "/repos/octocat/hello-world/pulls/2"]
+
+
+@pytest.mark.anyio
+async def test_etag_cache_replays_body_on_not_modified(tmp_path: Path) -> None:
     payload = {"number": 42, "title": "Add feature"}
+    conditional_headers: list[str | None] = []
 
     def handler(request: httpx.Request) -> httpx.Response:
-        assert request.headers.get("accept") == "application/vnd.github+json"
-        return httpx.Response(status_code=200, json=payload)
+        conditional_headers.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(status_code=304)
+        return httpx.Response(status_code=200, json=payload, headers={"ETag": '"v1"'})
 
+    cache = ETagCache(tmp_path / "etag_cache.json")
     client = GitHubClient(
         token=None,
         base_url="https://api.github.com",
         timeout=5.0,
         transport=_build_transport(handler),
+        etag_cache=cache,
     )
 
     async with client:
-        data = await client.get_pull_request("octocat", "hello-world", 42)
+        first = await client.get_pull_request("octocat", "hello-world", 42)
+        second = await client.get_pull_request("octocat", "hello-world", 42)
+
+    assert first == second == payload
+    assert conditional_headers == [None, '"v1"']
+    # A fresh cache instance reads the persisted validators back from disk
+    assert ETagCache(tmp_path / "etag_cache.json").get(
+        "application/vnd.github+json https://api.github.com/repos/octocat/hello-world/pulls/42"
+    )
 
-    assert data == payload
 
+@pytest.mark.anyio
+async def test_stream_revalidates_against_etag_cache(tmp_path: Path) -> None:
+    diff = b"diff --git a/x.py b/x.py\n" * 8192
+    conditional_headers: list[str | None] = []
 
-@pytest.mark.asyncio
-async def test_list_pull_requests_success() -> None:
-    payload = [
-        {"number": 1, "title": "First"},
-        {"number": 2, "title": "Second"},
-    ]
+    def handler(request: httpx.Request) -> httpx.Response:
+        conditional_headers.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"d1"':
+            return httpx.Response(status_code=304)
+        return httpx.Response(status_code=200, content=diff, headers={"ETag": '"d1"'})
+
+    client = GitHubClient(
+        token=None,
+        base_url="https://api.github.com",
+        timeout=5.0,
+        transport=_build_transport(handler),
+        etag_cache=ETagCache(tmp_path / "etag_cache.json"),
+    )
+
+    async with client:
+        streamed = [c async for c in client.stream_pull_request_diff("octocat", "hello-world", 7)]
+        replayed = [c async for c in client.stream_pull_request_diff("octocat", "hello-world", 7)]
+        # The buffered endpoint shares the cache entry the stream stored
+        text = await client.get_pull_request_diff("octocat", "hello-world", 7)
+
+    assert b"".join(streamed) == b"".join(replayed) == text.encode() == diff
+    assert max(len(c) for c in replayed) <= STREAM_CHUNK_SIZE
+    assert conditional_headers == [None, '"d1"', '"d1"']
+
+
+@pytest.mark.anyio
+async def test_stream_over_body_cap_is_not_cached(tmp_path: Path) -> None:
+    diff = b"diff --git a/x.py b/x.py\n" * 8192
+    conditional_headers: list[str | None] = []
 
     def handler(request: httpx.Request) -> httpx.Response:
-        assert request.headers.get("accept") == "application/vnd.github+json"
-        assert request.url.path == "/repos/octocat/hello-world/pulls"
-        # Query params are strings in the URL
-        assert request.url.params["state"] == "closed"
-        assert request.url.params["per_page"] == "10"
-        assert request.url.params["page"] == "2"
-        return httpx.Response(status_code=200, json=payload)
+        conditional_headers.append(request.headers.get("if-none-match"))
+        return httpx.Response(status_code=200, content=diff, headers={"ETag": '"d1"'})
 
+    cache = ETagCache(tmp_path / "etag_cache.json", max_body_bytes=STREAM_CHUNK_SIZE)
     client = GitHubClient(
-        token="abc123",
+        token=None,
         base_url="https://api.github.com",
         timeout=5.0,
         transport=_build_transport(handler),
+        etag_cache=cache,
     )
 
     async with client:
-        data = await client.list_pull_requests(
-            "octocat",
-            "hello-world",
-            state="closed",
-            per_page=10,
-            page=2,
-        )
+        first = [c async for c in client.stream_pull_request_diff("octocat", "hello-world", 7)]
+        second = [c async for c in client.stream_pull_request_diff("octocat", "hello-world", 7)]
+
+    assert b"".join(first) == b"".join(second) == diff
+    assert conditional_headers == [None, None]
+    assert len(cache) == 0
 
-    assert data == payload
 
+def test_etag_cache_evicts_least_recent_and_expired(tmp_path: Path) -> None:
+    cache = ETagCache(tmp_path / "etag_cache.json", max_entries=2)
+    for key in ("a", "b"):
+        cache.set(key, CachedResponse(body=key, etag=f'"{key}"'))
+    assert cache.get("a") is not None  # "a" is now the most recent
+    cache.set("c", CachedResponse(body="c", etag='"c"'))
+
+    assert cache.get("b") is None
+    assert [cache.get(key).body for key in ("a", "c")] == ["a", "c"]
+
+    sized = ETagCache(tmp_path / "sized.json", max_bytes=4, max_body_bytes=3)
+    for key in ("aaa", "bb", "cccc"):
+        sized.set(key, CachedResponse(body=key, etag=f'"{key}"'))
+    # "aaa" made room for "bb"; "cccc" is over the per-body cap and never stored
+    assert [sized.get(key) is not None for key in ("aaa", "bb", "cccc")] == [False, True, False]
+
+    stale = ETagCache(tmp_path / "stale.json", ttl=-1.0)
+    stale.set("a", CachedResponse(body="a", etag='"a"'))
+    assert stale.get("a") is None
+    assert len(stale) == 0
+
+
+@pytest.mark.anyio
+async def test_etag_cache_writes_only_on_flush(tmp_path: Path) -> None:
+    path = tmp_path / "etag_cache.json"
+    cache = ETagCache(path)
+    cache.set("a", CachedResponse(body="a", etag='"a"'))
+    assert not path.exists()
+
+    await cache.aflush()
+
+    assert ETagCache(path).get("a") == CachedResponse(body="a", etag='"a"')
+    assert [p.name for p in tmp_path.iterdir()] == ["etag_cache.json"]
+
+
+@pytest.mark.anyio
+async def test_stream_pull_request_diff_yields_body_bytes() -> None:
+    expected_diff = b"diff --git a/src/app/example.py b/src/app/example.py\n" * 4096
 
-@pytest.mark.asyncio
-async def test_list_pull_requests_handles_error() -> None:
     def handler(request: httpx.Request) -> httpx.Response:
-        return httpx.Response(status_code=403, json={"message": "Forbidden"})
+        assert request.headers.get("accept") == "application/vnd.github.v3.diff"
+        assert request.url.path == "/repos/octocat/hello-world/pulls/42"
+        return httpx.Response(status_code=200, content=expected_diff)
 
     client = GitHubClient(
-        token="bad-token",
+        token="test-token",
+        base_url="https://api.github.com",
+        timeout=5.0,
+        transport=_build_transport(handler),
+    )
+
+    async with client:
+        chunks = [
+            chunk async for chunk in client.stream_pull_request_diff("octocat", "hello-world", 42)
+        ]
+
+    assert b"".join(chunks) == expected_diff
+    assert len(chunks) > 1
+
+
+@pytest.mark.anyio
+async def test_stream_pull_request_diff_raises_for_not_found() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(status_code=404, json={"message": "Not Found"})
+
+    client = GitHubClient(
+        token="test-token",
         base_url="https://api.github.com",
         timeout=5.0,
         transport=_build_transport(handler),
@@ -126,86 +458,194 @@ async def test_list_pull_requests_handles_error() -> None:
 
     with pytest.raises(GitHubClientError) as exc_info:
         async with client:
-            await client.list_pull_requests("octocat", "hello-world")
+            async for _ in client.stream_pull_request_diff("octocat", "hello-world", 99):
+                pass
 
-    assert exc_info.value.status_code == 403
-    assert "Forbidden" in str(exc_info.value)
+    assert exc_info.value.status_code == 404
+    assert "Not Found" in str(exc_info.value)
 
 
-@pytest.mark.asyncio
-async def test_get_pull_request_files_success() -> None:
-    payload: list[dict[str, Any]] = [
-        {
-            "filename": "src/app/example.py",
-            "status": "modified",
-            "additions": 3,
-            "deletions": 1,
-            "changes": 4,
-        }
-    ]
+@pytest.mark.anyio
+async def test_rate_limited_request_waits_for_retry_after() -> None:
+    attempts = 0
 
     def handler(request: httpx.Request) -> httpx.Response:
-        assert request.headers.get("accept") == "application/vnd.github+json"
-        assert request.url.path == "/repos/octocat/hello-world/pulls/7/files"
-        return httpx.Response(status_code=200, json=payload)
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            return httpx.Response(
+                status_code=403,
+                json={"message": "You have exceeded a secondary rate limit"},
+                headers={"Retry-After": "7"},
+            )
+        return httpx.Response(status_code=200, json={"number": 42})
 
     client = GitHubClient(
-        token="abc123",
+        token="test-token",
         base_url="https://api.github.com",
         timeout=5.0,
         transport=_build_transport(handler),
     )
 
-    async with client:
-        files = await client.get_pull_request_files("octocat", "hello-world", 7)
+    with patch("src.app.github.client.asyncio.sleep", new_callable=AsyncMock) as sleep:
+        async with client:
+            pr = await client.get_pull_request("octocat", "hello-world", 42)
+
+    assert pr["number"] == 42
+    assert attempts == 2
+    sleep.assert_awaited_once_with(7.0)
+
+
+@pytest.mark.anyio
+async def test_stream_retries_transient_server_errors() -> None:
+    statuses = iter([502, 503, 200])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        status = next(statuses)
+        return httpx.Response(status_code=status, content=b"diff" if status == 200 else b"")
+
+    client = GitHubClient(
+        token="test-token",
+        base_url="https://api.github.com",
+        timeout=5.0,
+        transport=_build_transport(handler),
+    )
+
+    with patch("src.app.github.client.asyncio.sleep", new_callable=AsyncMock) as sleep:
+        async with client:
+            chunks = [
+                chunk
+                async for chunk in client.stream_pull_request_diff("octocat", "hello-world", 42)
+            ]
 
-    assert files == payload
+    assert chunks == [b"diff"]
+    assert [call.args[0] for call in sleep.await_args_list] == [1.0, 2.0]
 
 
-@pytest.mark.asyncio
-async def test_get_pull_request_commits_success() -> None:
-    payload = [
-        {
-            "sha": "abc",
-            "commit": {"message": "Initial"},
-        }
-    ]
+def test_rate_limiter_spreads_low_budget_until_reset() -> None:
+    limiter = RateLimiter(low_watermark=10)
+    reset_at = 1_000_000.0
+
+    limiter.update(
+        httpx.Response(
+            status_code=200,
+            headers={"X-RateLimit-Remaining": "500", "X-RateLimit-Reset": str(reset_at)},
+        )
+    )
+    assert limiter._interval(reset_at - 100) == 0.0
+
+    limiter.update(httpx.Response(status_code=200, headers={"X-RateLimit-Remaining": "5"}))
+    assert limiter._interval(reset_at - 100) == pytest.approx(20.0)
+
+
+@pytest.mark.anyio
+async def test_iter_pull_request_files_prefetches_until_last_page() -> None:
+    base = "https://api.github.com/repos/octocat/hello-world/pulls/42/files"
+    requested: list[str] = []
 
     def handler(request: httpx.Request) -> httpx.Response:
-        assert request.headers.get("accept") == "application/vnd.github+json"
-        assert request.url.path == "/repos/octocat/hello-world/pulls/7/commits"
-        return httpx.Response(status_code=200, json=payload)
+        page = request.url.params["page"]
+        requested.append(page)
+        link = f'<{base}?per_page=2&page=2>; rel="next", <{base}?per_page=2&page=3>; rel="last"'
+        headers = {"Link": link}
+        return httpx.Response(
+            status_code=200,
+            json=[{"filename": f"p{page}-{i}.py"} for i in range(2)],
+            headers=headers if page == "1" else {},
+        )
 
     client = GitHubClient(
-        token="abc123",
+        token="test-token",
         base_url="https://api.github.com",
         timeout=5.0,
         transport=_build_transport(handler),
     )
 
     async with client:
-        commits = await client.get_pull_request_commits("octocat", "hello-world", 7)
+        files = [
+            f["filename"]
+            async for f in client.iter_pull_request_files("octocat", "hello-world", 42, per_page=2)
+        ]
 
-    assert commits == payload
+    assert files == ["p1-0.py", "p1-1.py", "p2-0.py", "p2-1.py", "p3-0.py", "p3-1.py"]
+    assert sorted(requested) == ["1", "2", "3"]
 
 
-@pytest.mark.asyncio
-async def test_get_pull_request_patch_success() -> None:
-    expected_patch = "diff --git a/foo b/foo"
+@pytest.mark.anyio
+async def test_iter_pull_requests_follows_next_links_without_last() -> None:
+    base = "https://api.github.com/repos/octocat/hello-world/pulls"
 
     def handler(request: httpx.Request) -> httpx.Response:
-        assert request.headers.get("accept") == "application/vnd.github.v3.patch"
-        assert request.url.path == "/repos/octocat/hello-world/pulls/5"
-        return httpx.Response(status_code=200, text=expected_patch)
+        assert request.url.params["state"] == "closed"
+        page = int(request.url.params["page"])
+        headers = {"Link": f'<{base}?page={page + 1}>; rel="next"'} if page < 2 else {}
+        return httpx.Response(status_code=200, json=[{"number": page}], headers=headers)
 
     client = GitHubClient(
-        token="abc123",
+        token="test-token",
         base_url="https://api.github.com",
         timeout=5.0,
         transport=_build_transport(handler),
     )
 
     async with client:
-        patch = await client.get_pull_request_patch("octocat", "hello-world", 5)
+        numbers = [
+            pr["number"]
+            async for pr in client.iter_pull_requests("octocat", "hello-world", state="closed")
+        ]
+
+    assert numbers == [1, 2]
+
+
+@pytest.mark.anyio
+async def test_shared_clients_reuse_one_pool_without_closing_it() -> None:
+    seen_tokens: list[str | None] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_tokens.append(request.headers.get("authorization"))
+        return httpx.Response(status_code=200, text="diff")
+
+    shared = httpx.AsyncClient(
+        base_url="https://api.github.com", transport=_build_transport(handler)
+    )
+
+    for token in ("first-token", "second-token"):
+        async with GitHubClient.from_shared(shared, token=token) as client:
+            await client.get_pull_request_diff("octocat", "hello-world", 42)
+
+    assert seen_tokens == ["Bearer first-token", "Bearer second-token"]
+    assert not shared.is_closed
+    await shared.aclose()
+
+
+@pytest.mark.anyio
+async def test_fetch_pr_bundle_overlaps_requests() -> None:
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if request.url.path.endswith("/files"):
+            return httpx.Response(status_code=200, json=[{"filename": "src/app/main.py"}])
+        if request.headers["accept"] == "application/vnd.github.v3.diff":
+            return httpx.Response(status_code=200, text="diff --git a/x b/x")
+        return httpx.Response(status_code=200, json={"number": 42, "title": "Fix"})
+
+    client = GitHubClient(
+        token=None,
+        base_url="https://api.github.com",
+        timeout=5.0,
+        transport=httpx.MockTransport(handler),
+    )
+
+    async with client:
+        bundle = await client.fetch_pr_bundle("octocat", "hello-world", 42)
 
-    assert patch == expected_patch
+    assert bundle.metadata["title"] == "Fix"
+    assert bundle.files == [{"filename": "src/app/main.py"}]
+    assert bundle.diff == "diff --git a/x b/x"
+    assert peak == 3
@@ -1,9 +1,13 @@
 """Unit tests for LLM client."""
 
-from unittest.mock import AsyncMock, Mock, patch
+import json
+from unittest.mock import AsyncMock, patch
 
+import httpx
 import pytest
+from prometheus_client import REGISTRY
 
+from src.app.llm.cache import ResponseCache
 from src.app.llm.client import LLMClient, LLMConfig
 
 
@@ -23,6 +27,10 @@ class TestLLMConfig:
         assert config.model == "qwen2.5-coder:3b"
 
 
+def _ndjson(*lines: dict) -> bytes:
+    return b"".join(json.dumps(line).encode() + b"\n" for line in lines)
+
+
 class TestLLMClient:
     """Tests for LLMClient."""
 
@@ -32,89 +40,156 @@ class TestLLMClient:
         return LLMConfig(base_url="http://test:11434", model="test-model")
 
     @pytest.fixture
-    def llm_client(self, llm_config):
-        """Provide test LLM client."""
-        return LLMClient(config=llm_config)
+    def requests(self):
+        """Requests seen by the transport built with ``serve``."""
+        return []
+
+    @pytest.fixture
+    def serve(self, llm_config, requests):
+        """Build an LLMClient whose transport replays ``replies`` in order."""
+
+        def build(*replies: httpx.Response, cache: ResponseCache | None = None) -> LLMClient:
+            pending = iter(replies)
+
+            def handler(request: httpx.Request) -> httpx.Response:
+                requests.append(request)
+                return next(pending)
+
+            return LLMClient(config=llm_config, cache=cache, transport=httpx.MockTransport(handler))
 
-    def test_llm_client_initialization(self, llm_client, llm_config):
+        return build
+
+    def test_llm_client_initialization(self, llm_config):
         """Test LLMClient initializes correctly."""
+        llm_client = LLMClient(config=llm_config)
         assert llm_client._config == llm_config
         assert llm_client._client is not None
 
-    @pytest.mark.asyncio
-    async def test_generate_success(self, llm_client):
+    @pytest.mark.anyio
+    async def test_generate_success(self, serve, requests):
         """Test successful LLM generation."""
-        mock_response = Mock()
-        mock_response.json.return_value = {"response": "Generated code review"}
-        mock_response.raise_for_status = Mock()
-
-        with patch.object(llm_client._client, "post", new_callable=AsyncMock) as mock_post:
-            mock_post.return_value = mock_response
+        llm_client = serve(httpx.Response(200, json={"response": "Generated code review"}))
 
-            result = await llm_client.generate("Review this code")
+        result = await llm_client.generate("Review this code")
 
-            assert result == "Generated code review"
-            mock_post.assert_called_once()
-            call_kwargs = mock_post.call_args[1]
-            assert call_kwargs["json"]["model"] == "test-model"
-            assert call_kwargs["json"]["prompt"] == "Review this code"
-            assert call_kwargs["json"]["stream"] is False
+        assert result == "Generated code review"
+        assert len(requests) == 1
+        payload = json.loads(requests[0].content)
+        assert requests[0].url.path == "/api/generate"
+        assert payload["model"] == "test-model"
+        assert payload["prompt"] == "Review this code"
+        assert payload["stream"] is False
+        assert payload["keep_alive"] == "30m"
 
-    @pytest.mark.asyncio
-    async def test_generate_with_options(self, llm_client):
+    @pytest.mark.anyio
+    async def test_generate_with_options(self, serve, requests):
         """Test LLM generation with additional options."""
-        mock_response = Mock()
-        mock_response.json.return_value = {"response": "Response with options"}
-        mock_response.raise_for_status = Mock()
+        llm_client = serve(httpx.Response(200, json={"response": "Response with options"}))
 
-        with patch.object(llm_client._client, "post", new_callable=AsyncMock) as mock_post:
-            mock_post.return_value = mock_response
+        result = await llm_client.generate("Review code", temperature=0.7, max_tokens=500)
 
-            result = await llm_client.generate("Review code", temperature=0.7, max_tokens=500)
+        assert result == "Response with options"
+        options = json.loads(requests[0].content)["options"]
+        assert options["temperature"] == 0.7
+        assert options["num_predict"] == 500
 
-            assert result == "Response with options"
-            call_kwargs = mock_post.call_args[1]
-            assert call_kwargs["json"]["options"]["temperature"] == 0.7
-            assert call_kwargs["json"]["options"]["num_predict"] == 500
-
-    @pytest.mark.asyncio
-    async def test_generate_empty_response(self, llm_client):
+    @pytest.mark.anyio
+    async def test_generate_empty_response(self, serve):
         """Test handling of empty response from LLM."""
-        mock_response = Mock()
-        mock_response.json.return_value = {}
-        mock_response.raise_for_status = Mock()
-
-        with patch.object(llm_client._client, "post", new_callable=AsyncMock) as mock_post:
-            mock_post.return_value = mock_response
+        llm_client = serve(httpx.Response(200, json={}))
 
-            result = await llm_client.generate("Test prompt")
+        result = await llm_client.generate("Test prompt")
 
-            assert result == ""
+        assert result == ""
 
-    @pytest.mark.asyncio
-    async def test_generate_http_error(self, llm_client):
+    @pytest.mark.anyio
+    async def test_generate_http_error(self, serve):
         """Test handling of HTTP errors."""
-        mock_response = Mock()
-        mock_response.raise_for_status.side_effect = Exception("HTTP 500 Error")
+        llm_client = serve(httpx.Response(500, text="boom"))
+
+        with pytest.raises(httpx.HTTPStatusError, match="500"):
+            await llm_client.generate("Test prompt")
 
-        with patch.object(llm_client._client, "post", new_callable=AsyncMock) as mock_post:
-            mock_post.return_value = mock_response
+    @pytest.mark.anyio
+    async def test_generate_retries_rate_limited_requests(self, serve, requests):
+        """Test 429 replies are retried after the advertised Retry-After delay."""
+        llm_client = serve(
+            httpx.Response(429, headers={"Retry-After": "2"}),
+            httpx.Response(200, json={"response": "Eventually reviewed"}),
+        )
 
-            with pytest.raises(Exception, match="HTTP 500 Error"):
-                await llm_client.generate("Test prompt")
+        with patch("src.app.llm.client.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            result = await llm_client.generate("Review this code")
 
-    @pytest.mark.asyncio
-    async def test_close_client(self, llm_client):
+        assert result == "Eventually reviewed"
+        assert len(requests) == 2
+        mock_sleep.assert_awaited_once_with(2.0)
+
+    @pytest.mark.anyio
+    async def test_generate_serves_repeated_prompts_from_cache(self, serve, requests):
+        """Test identical requests hit the LLM once while different options miss."""
+        llm_client = serve(
+            httpx.Response(200, json={"response": "Cached review"}),
+            httpx.Response(200, json={"response": "Other review"}),
+            cache=ResponseCache(),
+        )
+
+        first = await llm_client.generate("Review this code", temperature=0.2)
+        second = await llm_client.generate("Review this code", temperature=0.2)
+        await llm_client.generate("Review this code", temperature=0.7)
+
+        assert first == second == "Cached review"
+        assert len(requests) == 2
+
+    @pytest.mark.anyio
+    async def test_generate_stream_yields_fragments(self, serve, requests):
+        """Test streamed NDJSON fragments are yielded in order."""
+        body = _ndjson({"response": "Looks "}, {"response": "good"}, {"done": True})
+        llm_client = serve(httpx.Response(200, content=body))
+
+        fragments = [f async for f in llm_client.generate_stream("Review this code")]
+
+        assert fragments == ["Looks ", "good"]
+        assert json.loads(requests[0].content)["stream"] is True
+
+    @pytest.mark.anyio
+    async def test_generate_stream_retries_overloaded_server(self, serve):
+        """Test a 503 before the stream starts is retried."""
+        llm_client = serve(
+            httpx.Response(503, headers={"Retry-After": "1"}),
+            httpx.Response(200, content=_ndjson({"response": "ok"})),
+        )
+
+        with patch("src.app.llm.client.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            fragments = [f async for f in llm_client.generate_stream("Review this code")]
+
+        assert fragments == ["ok"]
+        mock_sleep.assert_awaited_once_with(1.0)
+
+    @pytest.mark.anyio
+    async def test_generate_stream_raises_on_error_line(self, serve):
+        """Test an error reported mid-stream is raised, not silently truncated."""
+        body = _ndjson({"response": "partial"}, {"error": "model crashed"})
+        llm_client = serve(httpx.Response(200, content=body))
+
+        with pytest.raises(RuntimeError, match="model crashed"):
+            async for _ in llm_client.generate_stream("Review this code"):
+                pass
+
+    @pytest.mark.anyio
+    async def test_close_client(self, serve):
         """Test closing the HTTP client."""
-        with patch.object(llm_client._client, "aclose", new_callable=AsyncMock) as mock_close:
-            await llm_client.close()
-            mock_close.assert_called_once()
+        llm_client = serve()
+
+        await llm_client.close()
+
+        assert llm_client._client.is_closed
 
 
 class TestFakeLLMClient:
     """Tests for FakeLLMClient (test double)."""
 
-    @pytest.mark.asyncio
+    @pytest.mark.anyio
     async def test_fake_client_returns_predetermined_response(self):
         """Test FakeLLMClient returns fixed responses."""
         from src.app.llm.client import FakeLLMClient
@@ -123,7 +198,7 @@ class TestFakeLLMClient:
         result = await fake_client.generate("test prompt")
         assert result == "test response"
 
-    @pytest.mark.asyncio
+    @pytest.mark.anyio
     async def test_fake_client_default_response(self):
         """Test FakeLLMClient returns default for unknown prompts."""
         from src.app.llm.client import FakeLLMClient
@@ -131,3 +206,43 @@ class TestFakeLLMClient:
         fake_client = FakeLLMClient()
         result = await fake_client.generate("unknown prompt")
         assert "mock response" in result.lower()
+
+
+class TestResponseCache:
+    """Tests for ResponseCache."""
+
+    def test_evicts_least_recently_used_entry(self):
+        """Test the oldest untouched entry is dropped once the cache is full."""
+        cache = ResponseCache(max_entries=2)
+        cache.set(b"a", "A")
+        cache.set(b"b", "B")
+        assert cache.get(b"a") == "A"
+
+        cache.set(b"c", "C")
+
+        assert cache.get(b"b") is None
+        assert cache.get(b"a") == "A"
+        assert len(cache) == 2
+
+    def test_hits_and_misses_are_exported(self):
+        """Test lookups feed the Prometheus hit/miss counters."""
+
+        def sample(name: str) -> float:
+            return REGISTRY.get_sample_value(name) or 0.0
+
+        hits, misses = sample("llm_cache_hits_total"), sample("llm_cache_misses_total")
+        cache = ResponseCache()
+        cache.get(b"k")
+        cache.set(b"k", "v")
+        cache.get(b"k")
+
+        assert sample("llm_cache_hits_total") == hits + 1
+        assert sample("llm_cache_misses_total") == misses + 1
+
+    def test_expired_entries_are_misses(self):
+        """Test entries older than the TTL are not returned."""
+        cache = ResponseCache(ttl=10.0)
+        with patch("src.app.llm.cache.time.monotonic", side_effect=[100.0, 111.0]):
+            cache.set(b"k", "stale")
+            assert cache.get(b"k") is None
+        assert len(cache) == 0
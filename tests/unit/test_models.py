@@ -1,6 +1,8 @@
 """Unit tests for Pydantic models."""
 
 import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
 from pydantic import ValidationError
 
 from src.app.models import (
@@ -14,26 +16,52 @@ from src.app.models import (
     Severity,
 )
 
+# Small pools so generated pairs often collide on the dedup key
+_COMMENTS = st.builds(
+    ReviewComment,
+    file_path=st.sampled_from(["a.py", "b.py"]),
+    line_number=st.integers(min_value=1, max_value=3),
+    severity=st.sampled_from(Severity),
+    category=st.sampled_from(ReviewCategory),
+    message=st.sampled_from(["Possible bug", "Rename this"]),
+    suggestion=st.none() | st.just("Add a check"),
+    agent_name=st.sampled_from([None, "LogicAgent", "StyleAgent"]),
+)
+
+
+def _dedup_key(comment: ReviewComment) -> tuple[str, int, str]:
+    return comment.file_path, comment.line_number, comment.message
+
 
 class TestCodeChunk:
-    """Tests for CodeChunk model."""
+    """Tests for CodeChunk model.
 
-    def test_code_chunk_creation_success(self, sample_code_chunk_data):
+    Property-only tests use ``model_construct``: their inputs are hand-written
+    literals, so running the validators adds nothing to what is asserted.
+    """
+
+    def test_code_chunk_creation_success(self, sample_code_chunk):
         """Test successful CodeChunk creation."""
-        chunk = CodeChunk(**sample_code_chunk_data)
+        chunk = sample_code_chunk
         assert chunk.file_path == "src/main.py"
         assert chunk.language == Language.PYTHON
         assert len(chunk.new_lines) == 2
         assert chunk.start_line == 10
 
-    def test_code_chunk_line_count(self, sample_code_chunk_data):
+    def test_code_chunk_line_count(self, sample_code_chunk):
         """Test line_count property."""
-        chunk = CodeChunk(**sample_code_chunk_data)
+        chunk = sample_code_chunk
         assert chunk.line_count == 2
 
+    def test_code_chunk_code_text(self, sample_code_chunk, sample_code_chunk_data):
+        """Test code_text joins new lines and stays out of serialization."""
+        chunk = sample_code_chunk
+        assert chunk.code_text == "\n".join(sample_code_chunk_data["new_lines"])
+        assert "code_text" not in chunk.model_dump()
+
     def test_code_chunk_is_addition(self):
         """Test is_addition property."""
-        chunk = CodeChunk(
+        chunk = CodeChunk.model_construct(
             file_path="test.py",
             original_lines=[],
             new_lines=["new code"],
@@ -45,7 +73,7 @@ class TestCodeChunk:
 
     def test_code_chunk_is_deletion(self):
         """Test is_deletion property."""
-        chunk = CodeChunk(
+        chunk = CodeChunk.model_construct(
             file_path="test.py",
             original_lines=["old code"],
             new_lines=[],
@@ -55,9 +83,9 @@ class TestCodeChunk:
         assert chunk.is_addition is False
         assert chunk.is_modification is False
 
-    def test_code_chunk_is_modification(self, sample_code_chunk_data):
+    def test_code_chunk_is_modification(self, sample_code_chunk):
         """Test is_modification property."""
-        chunk = CodeChunk(**sample_code_chunk_data)
+        chunk = sample_code_chunk
         assert chunk.is_modification is True
         assert chunk.is_addition is False
         assert chunk.is_deletion is False
@@ -86,7 +114,7 @@ class TestFileDiff:
 
     def test_file_diff_total_changes(self):
         """Test total_changes property."""
-        diff = FileDiff(
+        diff = FileDiff.model_construct(
             file_path="test.py",
             status="modified",
             additions=10,
@@ -94,9 +122,9 @@ class TestFileDiff:
         )
         assert diff.total_changes == 15
 
-    def test_file_diff_with_chunks(self, sample_code_chunk_data):
+    def test_file_diff_with_chunks(self, sample_code_chunk):
         """Test FileDiff with code chunks."""
-        chunk = CodeChunk(**sample_code_chunk_data)
+        chunk = sample_code_chunk
         diff = FileDiff(
             file_path="src/main.py",
             status="modified",
@@ -109,35 +137,51 @@ class TestFileDiff:
 class TestReviewComment:
     """Tests for ReviewComment model."""
 
-    def test_review_comment_creation_success(self, sample_review_comment_data):
+    def test_review_comment_creation_success(self, sample_review_comment):
         """Test successful ReviewComment creation."""
-        comment = ReviewComment(**sample_review_comment_data)
+        comment = sample_review_comment
         assert comment.file_path == "src/main.py"
         assert comment.severity == Severity.WARNING
         assert comment.category == ReviewCategory.READABILITY
 
-    def test_review_comment_equality(self, sample_review_comment_data):
-        """Test ReviewComment equality for deduplication."""
-        comment1 = ReviewComment(**sample_review_comment_data)
-        comment2 = ReviewComment(**sample_review_comment_data)
-        assert comment1 == comment2
-        assert hash(comment1) == hash(comment2)
-
-    def test_review_comment_inequality_different_line(self, sample_review_comment_data):
-        """Test ReviewComment inequality with different line numbers."""
-        comment1 = ReviewComment(**sample_review_comment_data)
-        data2 = sample_review_comment_data.copy()
-        data2["line_number"] = 20
-        comment2 = ReviewComment(**data2)
-        assert comment1 != comment2
-
-    def test_review_comment_with_agent_name(self, sample_review_comment_data):
+    def test_review_comment_with_agent_name(self, sample_review_comment):
         """Test ReviewComment with agent_name."""
-        data = sample_review_comment_data.copy()
-        data["agent_name"] = "LogicAgent"
-        comment = ReviewComment(**data)
+        comment = sample_review_comment.model_copy(update={"agent_name": "LogicAgent"})
         assert comment.agent_name == "LogicAgent"
 
+    def test_review_comment_is_frozen(self, sample_review_comment):
+        """Test ReviewComment rejects mutation so its dedup hash stays stable."""
+        comment = sample_review_comment
+        with pytest.raises(ValidationError):
+            comment.line_number = 99
+
+    def test_review_comment_copy_rehashes_updated_fields(self, sample_review_comment):
+        """Test model_copy(update=...) does not inherit the source's cached hash."""
+        original_hash = hash(sample_review_comment)
+        moved = sample_review_comment.model_copy(update={"line_number": 20})
+        relabelled = sample_review_comment.model_copy(update={"agent_name": "LogicAgent"})
+        assert hash(moved) == hash(("src/main.py", 20, sample_review_comment.message))
+        assert hash(moved) != original_hash
+        assert hash(relabelled) == original_hash
+
+    @settings(max_examples=25, deadline=None)
+    @given(first=_COMMENTS, second=_COMMENTS)
+    def test_review_comment_equality_follows_dedup_key(self, first, second):
+        """Test equality tracks (file_path, line_number, message) only, and hash agrees."""
+        assert (first == second) == (_dedup_key(first) == _dedup_key(second))
+        if first == second:
+            assert hash(first) == hash(second)
+            assert len({first, second}) == 1
+
+    @settings(max_examples=25, deadline=None)
+    @given(comment=_COMMENTS)
+    def test_review_comment_copy_keeps_identity(self, comment):
+        """Test an unmodified copy stays equal and hashes the same."""
+        hash(comment)  # Populate the cached hash before copying
+        copied = comment.model_copy()
+        assert copied == comment
+        assert hash(copied) == hash(comment)
+
 
 class TestReviewRequest:
     """Tests for ReviewRequest model."""
@@ -165,6 +209,32 @@ class TestReviewRequest:
         with pytest.raises(ValidationError):
             ReviewRequest(pr_id=123)  # Missing repo
 
+    @pytest.mark.parametrize(
+        ("fields", "message"),
+        [
+            ({"pr_id": 123}, "'pr_id' requires 'repo'"),
+            ({"repo": "owner/repo"}, "'repo' requires 'pr_id'"),
+            ({"pr_id": 123, "repo": "owner/repo", "diff": "+x"}, "not both"),
+            ({}, "Must provide either"),
+        ],
+    )
+    def test_review_request_input_combination_messages(self, fields, message):
+        """Test each invalid input combination reports its specific reason."""
+        with pytest.raises(ValidationError, match=message):
+            ReviewRequest(**fields)
+
+    @pytest.mark.parametrize("repo", ["owner", "/repo", "owner/", "owner/repo/extra"])
+    def test_review_request_rejects_malformed_repo(self, repo):
+        """Test ReviewRequest rejects repos that are not exactly owner/repo."""
+        with pytest.raises(ValidationError):
+            ReviewRequest(pr_id=123, repo=repo)
+
+
+@pytest.fixture(scope="module")
+def canonical_response(three_severity_comments):
+    """One comment per severity, validated once for every count assertion."""
+    return ReviewResponse(comments=three_severity_comments)
+
 
 class TestReviewResponse:
     """Tests for ReviewResponse model."""
@@ -177,52 +247,53 @@ class TestReviewResponse:
         assert response.warning_count == 0
         assert response.info_count == 0
 
-    def test_review_response_with_comments(self, sample_review_comment_data):
+    @pytest.mark.parametrize(
+        ("field", "expected"),
+        [("total_issues", 3), ("critical_count", 1), ("warning_count", 1), ("info_count", 1)],
+    )
+    def test_review_response_with_comments(self, canonical_response, field, expected):
         """Test ReviewResponse calculates counts correctly."""
-        comments = [
-            ReviewComment(**{**sample_review_comment_data, "severity": "critical"}),
-            ReviewComment(
-                **{**sample_review_comment_data, "severity": "warning", "line_number": 20}
-            ),
-            ReviewComment(**{**sample_review_comment_data, "severity": "info", "line_number": 30}),
-        ]
-        response = ReviewResponse(comments=comments)
-        assert response.total_issues == 3
-        assert response.critical_count == 1
-        assert response.warning_count == 1
-        assert response.info_count == 1
+        assert getattr(canonical_response, field) == expected
 
-    def test_review_response_with_pr_info(self, sample_review_comment_data):
+    def test_review_response_copy_recounts_comments(self, canonical_response):
+        """Test model_copy with new comments does not reuse the cached tally."""
+        assert canonical_response.critical_count == 1
+        critical_only = canonical_response.comments[:1]
+        copied = canonical_response.model_copy(update={"comments": critical_only})
+        assert (copied.total_issues, copied.critical_count, copied.warning_count) == (1, 1, 0)
+
+    def test_review_response_is_frozen(self, canonical_response):
+        """Test ReviewResponse rejects reassigning comments under its cached counts."""
+        with pytest.raises(ValidationError):
+            canonical_response.comments = []
+
+    def test_review_response_with_pr_info(self, canonical_response):
         """Test ReviewResponse with PR information."""
-        comment = ReviewComment(**sample_review_comment_data)
-        response = ReviewResponse(
-            pr_id=123,
-            repo="owner/repo",
-            comments=[comment],
-        )
+        response = canonical_response.model_copy(update={"pr_id": 123, "repo": "owner/repo"})
         assert response.pr_id == 123
         assert response.repo == "owner/repo"
-        assert response.total_issues == 1
+        assert response.total_issues == 3
 
 
 class TestEnums:
     """Tests for enum values."""
 
-    def test_severity_enum_values(self):
-        """Test Severity enum has expected values."""
-        assert Severity.CRITICAL == "critical"
-        assert Severity.WARNING == "warning"
-        assert Severity.INFO == "info"
-
-    def test_review_category_enum_values(self):
-        """Test ReviewCategory enum has expected values."""
-        assert ReviewCategory.LOGIC == "logic"
-        assert ReviewCategory.READABILITY == "readability"
-        assert ReviewCategory.PERFORMANCE == "performance"
-        assert ReviewCategory.SECURITY == "security"
-
-    def test_language_enum_values(self):
-        """Test Language enum has expected values."""
-        assert Language.PYTHON == "python"
-        assert Language.JAVASCRIPT == "javascript"
-        assert Language.UNKNOWN == "unknown"
+    @pytest.mark.parametrize(
+        ("member", "expected"),
+        [
+            (Severity.CRITICAL, "critical"),
+            (Severity.WARNING, "warning"),
+            (Severity.INFO, "info"),
+            (ReviewCategory.LOGIC, "logic"),
+            (ReviewCategory.READABILITY, "readability"),
+            (ReviewCategory.PERFORMANCE, "performance"),
+            (ReviewCategory.SECURITY, "security"),
+            (Language.PYTHON, "python"),
+            (Language.JAVASCRIPT, "javascript"),
+            (Language.UNKNOWN, "unknown"),
+        ],
+        ids=str,
+    )
+    def test_enum_value(self, member, expected):
+        """Test each enum member compares equal to its wire value."""
+        assert member == expected